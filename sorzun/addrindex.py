@@ -0,0 +1,143 @@
+"""
+Reverse lookup from address to derivation path. An :class:`AddressIndex` is
+a file of fixed-width records, each a HASH160 key id followed by the
+``(account, chain, index)`` position of the key that produced it. Records
+are kept sorted so the file can be memory-mapped and binary searched
+without loading it, and it can be extended in place as more addresses are
+derived.
+"""
+
+import mmap
+import os
+import struct
+from heapq import merge
+
+from .base58 import b58dec
+from .cashaddr import cashdec, is_cashaddr
+
+#: Record layout: HASH160, account, chain, index (big endian)
+RECORD = struct.Struct(">20sIII")
+
+def addr_hash160(addr) -> bytes:
+    """
+    Return the HASH160 carried by `addr`, which can be a legacy base58check
+    address, a cashaddr string, or the 20 raw HASH160 bytes themselves
+    """
+    if isinstance(addr, bytes):
+        pl = addr
+    elif is_cashaddr(addr):
+        pl = cashdec(addr)[1:]
+    else:
+        pl = b58dec(addr, True)[1:]
+    if len(pl) != 20:
+        raise ValueError(f"not a HASH160 address: {addr!r}")
+    return pl
+
+class AddressIndex:
+    """
+    Sorted, memory-mapped ``HASH160 -> (account, chain, index)`` index stored
+    in the file at `path`, which is created on the first :meth:`extend` if
+    it does not exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mm = None
+        self._open()
+
+    def _open(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            with open(self.path, "rb") as fd:
+                self._mm = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        "Unmap the index file"
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._mm) // RECORD.size if self._mm is not None else 0
+
+    def _records(self):
+        size = RECORD.size
+        for i in range(0, len(self) * size, size):
+            yield self._mm[i:i + size]
+
+    def _positions(self):
+        "Yield the ``(account, chain, index)`` of every record"
+        if self._mm is not None:
+            for rec in RECORD.iter_unpack(self._mm):
+                yield rec[1:]
+
+    def extend(self, account_node, account: int, chain: int, indices):
+        """
+        Derive the addresses at `indices` on chain `chain` of account-level
+        node `account_node` and add them to the index under account number
+        `account`. The new records are merged into the file, which is
+        rewritten and replaced atomically. Records already present are not
+        duplicated.
+        """
+        kids = account_node.ckd(chain).children(indices)
+        if not kids:
+            return
+        new = sorted(RECORD.pack(k.id, account, chain, k.index) for k in kids)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as fd:
+            last = None
+            for rec in merge(self._records(), new):
+                if rec != last:
+                    fd.write(rec)
+                last = rec
+        self.close()
+        os.replace(tmp, self.path)
+        self._open()
+
+    def lookup(self, addr):
+        """
+        Return the ``(account, chain, index)`` of address `addr` (any form
+        accepted by :func:`addr_hash160`), or ``None`` if it is not indexed
+        """
+        h = addr_hash160(addr)
+        mm, size = self._mm, RECORD.size
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if mm[mid * size:mid * size + 20] < h:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and mm[lo * size:lo * size + 20] == h:
+            return RECORD.unpack_from(mm, lo * size)[1:]
+        return None
+
+def _account_number(node) -> int:
+    if node.index < 0x80000000:
+        raise ValueError("account node must be a hardened child")
+    return node.index - 0x80000000
+
+def build_index(path, accounts, stop: int, chains=(0, 1)) -> AddressIndex:
+    """
+    Build (or extend) the index at `path` with the first `stop` addresses of
+    each chain in `chains` of every account-level node in `accounts`. Each
+    account number is taken from the node's own hardened child index.
+    Addresses already in the index are not derived again.
+    """
+    numbers = [_account_number(account) for account in accounts]
+    index = AddressIndex(path)
+    have = {(n, c): bytearray(stop) for n in numbers for c in chains}
+    for number, chain, i in index._positions():
+        if (number, chain) in have and i < stop:
+            have[number, chain][i] = 1
+    for number, account in zip(numbers, accounts):
+        for chain in chains:
+            done = have[number, chain]
+            index.extend(account, number, chain,
+                         [i for i in range(stop) if not done[i]])
+    return index
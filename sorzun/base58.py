@@ -13,6 +13,16 @@
 #: Base58 Alphabet
 ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
 
+# Digits are converted in chunks of 10 so most arithmetic is on small ints.
+# Encoding emits each chunk two digits at a time from a table of digit pairs.
+_CHUNK = 10
+_CHUNK_BASE = 58 ** _CHUNK
+_PAIRS = [a + b for a in ALPHABET for b in ALPHABET]
+_DECODE = {c: i for i, c in enumerate(ALPHABET)}
+
+def _checksum(b: bytes) -> bytes:
+    return sha256(sha256(b).digest()).digest()[:4]
+
 def b58enc(b: bytes, check: bool = False) -> str:
     r"""
     Encode :class:`bytes` `b` to a base58 string. If `check` is set, use
@@ -50,17 +60,18 @@ def b58enc(b: bytes, check: bool = False) -> str:
     if isinstance(b, str):
         b = b.encode()
     if check:
-        digest = sha256(sha256(b).digest()).digest()
-        b += digest[:4]
+        b += _checksum(b)
     i = int.from_bytes(b, 'big')
     leading_nulls = len(b) - len(b.lstrip(b'\0'))
 
-    string = ''
+    out = []
     while i:
-        i, idx = divmod(i, 58)
-        string += ALPHABET[idx]
-    string += ALPHABET[0] * leading_nulls
-    return string[::-1]
+        i, chunk = divmod(i, _CHUNK_BASE)
+        for _ in range(_CHUNK // 2):
+            chunk, pair = divmod(chunk, 58 * 58)
+            out.append(_PAIRS[pair])
+    out.reverse()
+    return ALPHABET[0] * leading_nulls + ''.join(out).lstrip(ALPHABET[0])
 
 def b58dec(s: str, check: bool = False) -> bytes:
     """
@@ -100,23 +111,52 @@ def b58dec(s: str, check: bool = False) -> bytes:
           ...
         AssertionError: Checksum Failed
     """
-    i = 0
-    for char in s.rstrip('\n'):
-        i = i * 58 + ALPHABET.index(char)
+    digits = s.rstrip('\n')
+    table = _DECODE
+    top = len(digits) % _CHUNK
+    try:
+        i = 0
+        for char in digits[:top]:
+            i = i * 58 + table[char]
+        for k in range(top, len(digits), _CHUNK):
+            chunk = 0
+            for char in digits[k:k + _CHUNK]:
+                chunk = chunk * 58 + table[char]
+            i = i * _CHUNK_BASE + chunk
+    except KeyError as e:
+        raise ValueError(f"invalid base58 character {e.args[0]!r}") from None
     leading_ones = len(s) - len(s.lstrip(ALPHABET[0]))
     n = math.ceil(i.bit_length() / 8)
     pl = b'\0' * leading_ones + i.to_bytes(n, 'big')
     if check:
         pl, cs = pl[:-4], pl[-4:]
-        digest = sha256(sha256(pl).digest()).digest()
-        assert digest[:4] == cs, 'Checksum Failed'
+        assert _checksum(pl) == cs, 'Checksum Failed'
     return pl
 
+def _convert_records(decode: bool, check: bool, width: int,
+                     records: list) -> list:
+    """
+    Encode or decode each of `records` (``bytes`` without line terminator)
+    and return the output for each as newline-terminated ``bytes``. Encoded
+    output is wrapped to `width` columns if `width` is given.
+    """
+    from textwrap import fill
+
+    if decode:
+        return [b58dec(r.decode(), check) + b'\n' for r in records]
+    out = [b58enc(r, check) for r in records]
+    if width:
+        out = [fill(s, width) for s in out]
+    return [(s + '\n').encode() for s in out]
+
 def main():
     import argparse
     import sys
+    from functools import partial
     from textwrap import fill
 
+    from .util import pool_map
+
     parser = argparse.ArgumentParser(
         description='Encode/decode data using base58 or base58check encoding'
     )
@@ -131,14 +171,39 @@ def main():
         help='Use base58check (generate/verify checksums)'
     )
     parser.add_argument(
-        "-w", default=None,
+        "-w", default=None, type=int,
         help="Wrap width"
     )
+    parser.add_argument(
+        '-l', '--lines',
+        action='store_true',
+        help='Treat each input line as a separate record and stream output '
+             'one line per record (unwrapped unless -w is given)'
+    )
+    parser.add_argument(
+        '-j', '--jobs', default=1, type=int,
+        help='Number of worker processes for --lines mode'
+    )
     args = parser.parse_args()
 
+    if args.lines:
+        convert = partial(_convert_records, args.decode, args.check, args.w)
+        records = (line.rstrip(b'\r\n') for line in sys.stdin.buffer)
+        out = (pool_map(convert, records, args.jobs) if args.jobs > 1
+               else (convert([r])[0] for r in records))
+        interactive = sys.stdout.isatty()
+        for line in out:
+            sys.stdout.buffer.write(line)
+            if interactive:
+                sys.stdout.buffer.flush()
+        return
+
     data = sys.stdin.buffer.read()
 
     if args.decode:
         sys.stdout.buffer.write(b58dec(data.decode(), args.check))
     else:
         print(fill(b58enc(data, args.check), args.w or 70))
+
+if __name__ == "__main__":
+    main()
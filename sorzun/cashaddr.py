@@ -40,6 +40,7 @@
 .. _checksum: https://github.com/bitcoincashorg/bitcoincash.org/blob/master/spec/cashaddr.md#checksum
 """
 import re
+from functools import lru_cache
 
 from .util import convertbits
 
@@ -49,8 +50,26 @@
 _GEN = [0x98F2BC8E61, 0x79B76D99E2, 0xF33E5FB3C4, 0xAE2EABE2A8, 0x1E4F43E470]
 
 
+# _GEN_TABLE[c0] is the XOR of the generators selected by the bits of c0
+_GEN_TABLE = [0] * 32
+for _c0 in range(32):
+    for _i in range(5):
+        if (_c0 >> _i) & 1:
+            _GEN_TABLE[_c0] ^= _GEN[_i]
+del _c0, _i
+
+def _polymod_state(data: bytes, c: int = 1) -> int:
+    table = _GEN_TABLE
+    for d in data:
+        c = ((c & 0x07FFFFFFFF) << 5) ^ d ^ table[c >> 35]
+    return c
+
 def polymod(data: bytes) -> int:
     "Return the polymod of input byte sequence `data` over :math:`GF(2^5)`"
+    return _polymod_state(data) ^ 1
+
+def _polymod_reference(data: bytes) -> int:
+    "Bitwise reference implementation of :func:`polymod`"
     c = 1
     for d in data:
         c0 = c >> 35
@@ -59,6 +78,20 @@ def polymod(data: bytes) -> int:
             c ^= _GEN[i] if ((c0 >> i) & 1) else 0
     return c ^ 1
 
+# bytes.translate tables between 5-bit symbols and alphabet characters.
+# Decoding accepts either case and maps every other byte to 0xFF.
+_ENCODE_TABLE = ALPHABET.encode().ljust(256, b"\xff")
+_DECODE_TABLE = bytearray(b"\xff" * 256)
+for _i, _c in enumerate(ALPHABET):
+    _DECODE_TABLE[ord(_c)] = _DECODE_TABLE[ord(_c.upper())] = _i
+_DECODE_TABLE = bytes(_DECODE_TABLE)
+del _i, _c
+
+@lru_cache(maxsize=64)
+def _prefix_state(prefix: str) -> int:
+    "Polymod state after processing the expanded `prefix`"
+    return _polymod_state(prefix_expand(prefix))
+
 def b32decode(l: str) -> list:
     """
     Decode base32-encoded string `l` into list of integers indicating the
@@ -119,7 +152,7 @@ def calculate_checksum(prefix: str, payload: bytes) -> bytes:
     message octets expanded with :func:`sorzun.util.convertbits` to 5-bit
     symbols represented as bytes.
     """
-    poly = polymod(prefix_expand(prefix) + payload + b"\0"* 8)
+    poly = _polymod_state(payload + b"\0" * 8, _prefix_state(prefix)) ^ 1
     return bytes([((poly >> 5 * (7 - i)) & 0x1f) for i in range(8)])
 
 def verify_checksum(prefix: str, payload: bytes) -> bool:
@@ -128,7 +161,7 @@ def verify_checksum(prefix: str, payload: bytes) -> bool:
     that the checksum (at the end of the payload) is valid. Returns ``True``
     if the checksum is valid and ``False`` otherwise.
     """
-    return polymod(prefix_expand(prefix) + payload) == 0
+    return _polymod_state(payload, _prefix_state(prefix)) == 1
 
 def cashenc(pl: bytes, prefix: str = "bitcoincash") -> str:
     r"""
@@ -157,7 +190,7 @@ def cashenc(pl: bytes, prefix: str = "bitcoincash") -> str:
     """
     pl32 = bytes(convertbits(pl, 8, 5))
     checksum = calculate_checksum(prefix, pl32)
-    return prefix + ":" + b32encode(pl32 + checksum)
+    return prefix + ":" + (pl32 + checksum).translate(_ENCODE_TABLE).decode()
 
 def cashdec(s: str) -> bytes:
     r"""
@@ -194,17 +227,47 @@ def cashdec(s: str) -> bytes:
     ValueError: invalid base32 symbol 'b' at position 5
     """
     prefix, pltxt = s.split(":")
-    pltxt = pltxt.lower() # to support case insensitive input
-    dec = b32decode(pltxt)
-    if -1 in dec:
-        badloc = dec.index(-1)
+    # case insensitive: the decode table maps both cases
+    pl32 = pltxt.encode("ascii", "replace").translate(_DECODE_TABLE)
+    badloc = pl32.find(b"\xff")
+    if badloc != -1:
         raise ValueError(
-            f"invalid base32 symbol '{pltxt[badloc]}' at position {badloc}"
+            f"invalid base32 symbol '{pltxt[badloc].lower()}' "
+            f"at position {badloc}"
         )
-    pl32 = bytes(dec)
     assert verify_checksum(prefix, pl32), "Bad checksum"
     return bytes(convertbits(pl32[:-8], 5, 8, False))
 
+def cashenc_many(payloads, prefix: str = "bitcoincash") -> list:
+    """
+    Encode each of `payloads` with :func:`cashenc` using the same `prefix`.
+    Returns a list with a ``(cashaddr, error)`` pair per payload: the
+    encoded string and ``None``, or ``None`` and the exception raised while
+    encoding it. The prefix checksum state is computed once for all items.
+    """
+    out = []
+    for pl in payloads:
+        try:
+            out.append((cashenc(pl, prefix), None))
+        except Exception as e:
+            out.append((None, e))
+    return out
+
+def cashdec_many(strings) -> list:
+    """
+    Decode each of `strings` with :func:`cashdec`. Returns a list with a
+    ``(payload, error)`` pair per string: the decoded bytes and ``None``, or
+    ``None`` and the exception (such as a bad checksum or bad symbol)
+    raised while decoding it. Bad inputs do not stop the batch.
+    """
+    out = []
+    for s in strings:
+        try:
+            out.append((cashdec(s), None))
+        except Exception as e:
+            out.append((None, e))
+    return out
+
 def is_cashaddr(s: str) -> bool:
     """
     Return ``True`` if and only if string `s` is a cashaddr encoded string.
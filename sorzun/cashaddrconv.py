@@ -1,8 +1,13 @@
 "Convert bitcoin addresses between legacy and cashaddr format"
 
 import argparse
+import json
+import sys
+from functools import partial
+
 from .cashaddr import cashenc, cashdec, is_cashaddr
 from .base58 import b58enc, b58dec
+from .util import pool_map
 
 _b58checkenc = lambda x: b58enc(x, True)
 _b58checkdec = lambda x: b58dec(x, True)
@@ -26,25 +31,61 @@ def convert_word(word):
     )
     return ivbyte, ovbyte, intype, legaddr, cashaddr
 
+def _format_row(fmt, lineno, wordno, word):
+    try:
+        ivbyte, ovbyte, intype, legaddr, cashaddr = convert_word(word)
+    except Exception as e:
+        err = f"{type(e).__name__}: {e}"
+        if fmt == "table":
+            return f"{'':14}ERROR  {word} {err}"
+        if fmt == "tsv":
+            return "\t".join([str(lineno), str(wordno), word] + [""] * 5
+                             + [err])
+        return json.dumps({"line": lineno, "word": wordno, "input": word,
+                           "error": err})
+    ivbyte, ovbyte = ivbyte.hex().upper(), ovbyte.hex().upper()
+    if fmt == "table":
+        return (f"{lineno:4d} {wordno:2d} {ivbyte:2} {ovbyte:2} "
+                f"{intype:<6} {legaddr:<34} {cashaddr}")
+    if fmt == "tsv":
+        return "\t".join([str(lineno), str(wordno), word, ivbyte, ovbyte,
+                          intype, legaddr, cashaddr, ""])
+    return json.dumps({"line": lineno, "word": wordno, "input": word,
+                       "ivbyte": ivbyte, "ovbyte": ovbyte, "type": intype,
+                       "legacy": legaddr, "cashaddr": cashaddr})
+
+def convert_lines(fmt, lines):
+    """
+    Convert every word of each ``(lineno, line)`` pair in `lines` and return
+    a list with the formatted output text of each line (empty for lines
+    without words). `fmt` is one of :data:`FORMATS`.
+    """
+    return ["".join(_format_row(fmt, lineno, wordno, word) + "\n"
+                    for wordno, word in enumerate(line.split()))
+            for lineno, line in lines]
+
+#: Output formats supported by :func:`convert_lines`
+FORMATS = ("table", "tsv", "jsonl")
+
 def main():
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("file", nargs="?", default="-",
                         type=argparse.FileType('r'))
+    parser.add_argument("-f", "--format", choices=FORMATS, default="table",
+                        help="output format")
+    parser.add_argument("-j", "--jobs", default=1, type=int,
+                        help="number of worker processes")
     args = parser.parse_args()
-    txt = args.file.read()
-
-    for lineno, line in enumerate(txt.split("\n")):
-        for wordno, word in enumerate(line.split()):
-            try:
-                ivbyte, ovbyte, intype, legaddr, cashaddr = convert_word(word)
-            except Exception as e:
-                print(f"{'':14}ERROR  {word} {type(e).__name__}: {e}")
-                continue
-            print(
-                f"{lineno:4d} {wordno:2d} "
-                f"{ivbyte.hex().upper():2} {ovbyte.hex().upper():2} "
-                f"{intype:<6} {legaddr:<34} {cashaddr}"
-            )
+
+    convert = partial(convert_lines, args.format)
+    lines = enumerate(args.file)
+    out = (pool_map(convert, lines, args.jobs) if args.jobs > 1
+           else (convert([line])[0] for line in lines))
+    if args.format == "tsv":
+        sys.stdout.write("line\tword\tinput\tivbyte\tovbyte\ttype\t"
+                         "legacy\tcashaddr\terror\n")
+    for text in out:
+        sys.stdout.write(text)
 
 if __name__ == "__main__":
     main()
@@ -6,13 +6,66 @@
 
 import hashlib
 import hmac
-from functools import lru_cache
 from collections import namedtuple
 from os import urandom
 
-from .ecc import Point, G, N
+from .ecc import (Point, G, N, multi_mul, fixed_base_multiply,
+                  jacobian_add_affine, batch_from_jacobian)
 from .base58 import b58enc, b58dec
 from .cashaddr import cashenc
+from .util import LRUCache
+
+try:
+    from functools import cached_property
+except ImportError:
+    from .util import cached_property
+
+#: Cache of derived nodes keyed by starting node and path prefix. Used by
+#: :meth:`XPubKey.derive` to skip re-deriving shared path prefixes. Resize it
+#: with ``derivation_cache.resize(n)``; a size of 0 disables it.
+derivation_cache = LRUCache(4096)
+#: Whether :meth:`XPubKey.derive` caches nodes derived from private keys.
+#: Set with :func:`configure_memo`.
+cache_private = True
+
+#: Memo of :attr:`XPrivKey.pubkey` keyed by private key. Holds private key
+#: material, see :func:`configure_memo` and :func:`clear_private_memo`.
+pubkey_memo = LRUCache(4096)
+#: Memo of SEC1 serializations keyed by public key point
+sec_memo = LRUCache(4096)
+#: Memo of HASH160 key ids keyed by public key point
+id_memo = LRUCache(4096)
+
+def configure_memo(maxsize: int = 4096, private: bool = True):
+    """
+    Set the size limit of the memo caches for values derived from keys
+    (public keys, SEC1 serializations and key ids). If `private` is
+    ``False``, neither public keys of private keys nor nodes derived from
+    private keys by :meth:`XPubKey.derive` are retained, and any already
+    held are cleared.
+    """
+    global cache_private
+    sec_memo.resize(maxsize)
+    id_memo.resize(maxsize)
+    pubkey_memo.resize(maxsize if private else 0)
+    cache_private = private
+    if not private:
+        clear_private_memo()
+
+def clear_private_memo():
+    """
+    Drop all memoized values and cached nodes that hold private key
+    material, from :data:`pubkey_memo` and :data:`derivation_cache`.
+    """
+    pubkey_memo.clear()
+    derivation_cache.remove_if(lambda key: issubclass(key[0][0], XPrivKey))
+
+def _sec(point) -> bytes:
+    b = sec_memo.get(point)
+    if b is None:
+        b = bytes(point)
+        sec_memo.put(point, b)
+    return b
 
 def hash160(msg: bytes) -> bytes:
     """
@@ -90,11 +143,26 @@ def cashaddr(self):
     @property
     def id(self):
         'Key ID. HASH160 of compressed serialized PubKey (bytes)'
-        return hash160(bytes(self.pubkey))
+        pubkey = self.pubkey
+        keyid = id_memo.get(pubkey)
+        if keyid is None:
+            keyid = hash160(_sec(pubkey))
+            id_memo.put(pubkey, keyid)
+        return keyid
+
+    @property
+    def fingerprint(self):
+        'Key fingerprint. First 4 bytes of the key ID (bytes)'
+        return self.id[:4]
+
+    @property
+    def sec(self):
+        'SEC1 compressed-form byte encoding of the ECDSA pubkey (bytes)'
+        return _sec(self.pubkey)
 
     def __bytes__(self):
         "SEC1 compressed-form byte encoding of the ECDSA pubkey (bytes)"
-        return bytes(self.pubkey)
+        return self.sec
 
 
     def ckd(self, i: int) -> "XPubKey":
@@ -107,11 +175,60 @@ def ckd(self, i: int) -> "XPubKey":
         if not i < 0x80000000:
             raise ProtocolError("It is disallowed to derive a hardend subkey "
                 "from public node")
-        pl = bytes(self.pubkey) + i.to_bytes(4, 'big')
+        pl = self.sec + i.to_bytes(4, 'big')
         I = hmac.new(self.chaincode, pl, 'sha512').digest()
         IL, IR = I[:32], I[-32:]
         k = int.from_bytes(IL, 'big')
-        return XPubKey(G * k  + self.keydata, IR)
+        return XPubKey(multi_mul([(k, G), (1, self.keydata)]), IR)
+
+    def children(self, indices) -> list:
+        """
+        Derive and return a list of the children at each index in `indices`.
+        The result is identical to calling :meth:`ckd` on each index, but the
+        parent serialization and keyed HMAC are set up once and all the child
+        public keys are normalized together with a single field inversion.
+        """
+        indices = list(indices)
+        if any(not i < 0x80000000 for i in indices):
+            raise ProtocolError("It is disallowed to derive a hardend subkey "
+                "from public node")
+        mac = hmac.new(self.chaincode, self.sec, 'sha512')
+        K = self.keydata
+        jpts, ccs = [], []
+        for i in indices:
+            h = mac.copy()
+            h.update(i.to_bytes(4, 'big'))
+            I = h.digest()
+            k = int.from_bytes(I[:32], 'big')
+            jpts.append(jacobian_add_affine(fixed_base_multiply(k), K))
+            ccs.append(I[32:])
+        pts = batch_from_jacobian(jpts)
+        return [XPubKey(Point(*p), c) for p, c in zip(pts, ccs)]
+
+    def ckd_range(self, start: int, stop: int) -> list:
+        """
+        Derive and return a list of the children with indices in
+        ``range(start, stop)``. See :meth:`children`.
+        """
+        return self.children(range(start, stop))
+
+    def iter_children(self, start: int = 0, batch: int = 64):
+        """
+        Lazily yield the children with consecutive indices beginning at
+        `start`, stopping at the end of the hardened or non-hardened index
+        range that `start` is in. Children are derived in batches with
+        :meth:`children`. The batch size starts small and doubles up to
+        `batch`, so a consumer that stops early wastes little work. Raises
+        :class:`ValueError` if `batch` is less than 1.
+        """
+        if batch < 1:
+            raise ValueError("batch must be at least 1")
+        limit = 0x80000000 if start < 0x80000000 else 0x100000000
+        size = min(8, batch)
+        while start < limit:
+            stop = min(start + size, limit)
+            yield from self.children(range(start, stop))
+            start, size = stop, min(2 * size, batch)
 
     def derive(self, path):
         """
@@ -125,13 +242,31 @@ def derive(self, path):
         where a,b,c,d.... are positive integers each optionally suffixed with
         'H'. The integers are the child indices at each level and the 'H'
         signifies that a node is hardened.
+
+        Derived nodes are kept in :data:`derivation_cache`, and derivation
+        resumes from the longest previously derived prefix of `path`. Nodes
+        derived from private keys are only cached if :data:`cache_private`
+        is set.
         """
         if not path:
             return self
-        key = self
-        for x in path.split('/'):
-            x = int(x) if x[-1] != 'H' else int(x[:-1]) + 0x80000000
-            key = key.ckd(int(x))
+        steps = tuple(int(x) if x[-1] != 'H' else int(x[:-1]) + 0x80000000
+                      for x in path.split('/'))
+        if isinstance(self, XPrivKey) and not cache_private:
+            key = self
+            for step in steps:
+                key = key.ckd(step)
+            return key
+        root = (type(self), self)
+        prefixes = [(root, steps[:n]) for n in range(len(steps), 0, -1)]
+        i, key = derivation_cache.lookup(prefixes)
+        if i is None:
+            done, key = 0, self
+        else:
+            done = len(steps) - i
+        for n in range(done, len(steps)):
+            key = key.ckd(steps[n])
+            derivation_cache.put((root, steps[:n + 1]), key)
         return key
 
     def __str__(self):
@@ -179,21 +314,48 @@ def ckd(self, i: int):
             indices over ``0x80000000`` are hardened children.
         """
         plbe = (XPrivKey.__bytes__(self) if i >= 0x80000000
-                else bytes(self.pubkey))
+                else self.sec)
         ibytes = i.to_bytes(4, 'big')
         I = hmac.new(self.chaincode, plbe + ibytes, 'sha512').digest()
         IL, IR = I[:32], I[-32:]
         k = (int.from_bytes(IL, 'big') + self.keydata) % N
         return XPrivKey(k, IR)
 
+    def children(self, indices) -> list:
+        """
+        Derive and return a list of the children at each index in `indices`,
+        identical to calling :meth:`ckd` on each index but with the parent
+        serializations and keyed HMACs set up only once.
+        """
+        indices = list(indices)
+        macs = {}
+        if any(i >= 0x80000000 for i in indices):
+            macs[True] = hmac.new(
+                self.chaincode, XPrivKey.__bytes__(self), 'sha512')
+        if any(i < 0x80000000 for i in indices):
+            macs[False] = hmac.new(
+                self.chaincode, self.sec, 'sha512')
+        out = []
+        for i in indices:
+            h = macs[i >= 0x80000000].copy()
+            h.update(i.to_bytes(4, 'big'))
+            I = h.digest()
+            k = (int.from_bytes(I[:32], 'big') + self.keydata) % N
+            out.append(XPrivKey(k, I[32:]))
+        return out
+
     def wif(self, vbyte=b'\x80'):
         'WIF string privkey'
         return b58enc(vbyte + self.keydata.to_bytes(32, 'big') + b'\x01', True)
 
     @property
-    @lru_cache()
     def pubkey(self):
-        return G * self.keydata
+        'Public Key Curve Point (ecc.Point), memoized in :data:`pubkey_memo`'
+        pubkey = pubkey_memo.get(self.keydata)
+        if pubkey is None:
+            pubkey = G * self.keydata
+            pubkey_memo.put(self.keydata, pubkey)
+        return pubkey
 
     def __bytes__(self):
         """
@@ -209,9 +371,13 @@ class PubBIP32Node(_pubnodebase, XPubKey):
     Same as a XPubKey but it also tracks some additional tree position data
     during key derivation and implementes BIP32-standardized serialization
     format.
+
+    Values derived from the key (SEC1 serialization, key id, fingerprint,
+    xpub and address strings) are computed lazily and cached on the node.
+    The node stays an immutable tuple: the caches do not take part in
+    equality or hashing, and no attributes can be assigned.
     """
 
-    __slots__ = ()
     vbytes = b'\x04\x88\xB2\x1E'    # bitcoin xpubkey version bytes in BIP32
 
     def __new__(cls, kd, cc, depth=0, parent_fingerprint=b'\0' * 4, index=0):
@@ -230,6 +396,31 @@ def __new__(cls, kd, cc, depth=0, parent_fingerprint=b'\0' * 4, index=0):
         """
         return super().__new__(cls, kd, cc, depth, parent_fingerprint, index)
 
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    sec = cached_property(XPubKey.sec.fget)
+    id = cached_property(XPubKey.id.fget)
+    fingerprint = cached_property(XPubKey.fingerprint.fget)
+
+    def addr(self, vbyte: bytes = b'\0') -> str:
+        """
+        Bitcoin P2PKH address with version byte `vbyte`. A ``str`` is returned
+        using base58check encoding
+        """
+        cache = self.__dict__.setdefault('_addr', {})
+        if vbyte not in cache:
+            cache[vbyte] = super().addr(vbyte)
+        return cache[vbyte]
+
+    @cached_property
+    def _cashaddr(self):
+        return super().cashaddr()
+
+    def cashaddr(self):
+        "Bitcoin Cash cashaddr string"
+        return self._cashaddr
+
     def __bytes__(self):
         " Return the bytes of the BIP32 extended key serialization."
         depth = self.depth.to_bytes(1, 'big')
@@ -247,7 +438,7 @@ def __str__(self):
                 f"parent   : {fingr}\nchaincode: {cc}\nkeydata  : {keydat}\n"
                 f"BIP32 str: {self.xpub}")
 
-    @property
+    @cached_property
     def xpub(self):
         "BIP32 xpub string encoding"
         return b58enc(bytes(self), True)
@@ -255,9 +446,17 @@ def xpub(self):
     def ckd(self, i):
         xkey = super().ckd(i)
         depth = self.depth + 1
-        finger = self.id[:4]
+        finger = self.fingerprint
         return type(self)(*xkey, depth, finger, i)
 
+    def children(self, indices):
+        indices = list(indices)
+        depth = self.depth + 1
+        finger = self.fingerprint
+        cls = type(self)
+        return [cls(*xkey, depth, finger, i)
+                for xkey, i in zip(super().children(indices), indices)]
+
 class PrivBIP32Node(PubBIP32Node, XPrivKey):
     """
     Same as a XPrivKey but it also tracks some additional tree position data
@@ -267,10 +466,11 @@ class PrivBIP32Node(PubBIP32Node, XPrivKey):
     .. inheritance-diagram:: PrivBIP32Node
        :parts: 1
     """
-    __slots__ = ()
     vbytes = b'\x04\x88\xAD\xE4'
 
-    @property
+    pubkey = cached_property(XPrivKey.pubkey.fget)
+
+    @cached_property
     def xpub(self):
         return PubBIP32Node(self.pubkey, *self[1:]).xpub
 
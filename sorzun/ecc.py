@@ -1,22 +1,15 @@
+import hashlib
+import os
+import tempfile
 from collections import namedtuple
 
-P  = 2 ** 256 - 2 ** 32 - 977
+from .field import P, inv, sqrt
+
 N  = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 GX = 0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798
 GY = 0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8
 A, B = 0, 7
 
-def inv(a, n):
-    if a == 0:
-        return 0
-    lm, hm = 1, 0
-    low, high = a % n, n
-    while low > 1:
-        r = high//low
-        nm, new = hm - lm * r, high - low * r
-        lm, low, hm, high = nm, new, lm, low
-    return lm % n
-
 def to_jacobian(p):
     o = (p[0], p[1], 1)
     return o
@@ -55,10 +48,57 @@ def jacobian_add(p, q):
     nz = (H * p[2] * q[2]) % P
     return (nx, ny, nz)
 
+def jacobian_add_affine(p, q):
+    'Mixed addition of Jacobian point `p` and affine point `q`'
+    if not p[1]:
+        return (q[0], q[1], 1)
+    if not q[1]:
+        return p
+    z2 = (p[2] * p[2]) % P
+    U2 = (q[0] * z2) % P
+    S2 = (q[1] * z2 * p[2]) % P
+    if p[0] == U2:
+        if p[1] != S2:
+            return (0, 0, 1)
+        return jacobian_double(p)
+    H = U2 - p[0]
+    R = S2 - p[1]
+    H2 = (H * H) % P
+    H3 = (H * H2) % P
+    U1H2 = (p[0] * H2) % P
+    nx = (R ** 2 - H3 - 2 * U1H2) % P
+    ny = (R * (U1H2 - nx) - p[1] * H3) % P
+    nz = (H * p[2]) % P
+    return (nx, ny, nz)
+
 def from_jacobian(p):
     z = inv(p[2], P)
     return ((p[0] * z**2) % P, (p[1] * z**3) % P)
 
+def batch_from_jacobian(points):
+    """
+    Convert a sequence of Jacobian points to affine coordinates using a single
+    modular inversion (Montgomery's simultaneous inversion trick). Returns a
+    list of ``(x, y)`` tuples in the same order as `points`.
+    """
+    prefix = []
+    acc = 1
+    for p in points:
+        prefix.append(acc)
+        if p[1]:
+            acc = (acc * p[2]) % P
+    acc = inv(acc, P)
+    out = [(0, 0)] * len(prefix)
+    for i in range(len(prefix) - 1, -1, -1):
+        x, y, z = points[i]
+        if not y:
+            continue
+        zinv = (acc * prefix[i]) % P
+        acc = (acc * z) % P
+        zinv2 = (zinv * zinv) % P
+        out[i] = ((x * zinv2) % P, (y * zinv2 * zinv) % P)
+    return out
+
 def jacobian_multiply(a, n):
     if a[1] == 0 or n == 0:
         return (0, 0, 1)
@@ -71,6 +111,282 @@ def jacobian_multiply(a, n):
     if (n % 2) == 1:
         return jacobian_add(jacobian_double(jacobian_multiply(a, n//2)), a)
 
+def wnaf(n, w):
+    """
+    Return the width-`w` non-adjacent form of non-negative integer `n` as a
+    list of signed odd digits (or zeros), least significant digit first.
+    """
+    digits = []
+    half, full = 1 << (w - 1), 1 << w
+    while n:
+        d = 0
+        if n & 1:
+            d = n & (full - 1)
+            if d >= half:
+                d -= full
+            n -= d
+        digits.append(d)
+        n >>= 1
+    return digits
+
+#: Cube root of unity mod P: :math:`(\beta x, y) = \lambda (x, y)`
+BETA = 0x7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE
+#: Cube root of unity mod N, the eigenvalue of the endomorphism
+LAMBDA = 0x5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72
+
+_A1 = 0x3086D221A7D46BCDE86C90E49284EB15
+_B1 = -0xE4437ED6010E88286F547FA90ABFE4C3
+_A2 = 0x114CA50F7A8E2F3F657C1108D9D44CFD8
+_B2 = _A1
+
+def glv_split(n):
+    r"""
+    Split scalar `n` into two signed halves of about 128 bits each such that
+    :math:`k_1 + k_2 \lambda \equiv n \pmod N`. Returns ``(k1, k2)``.
+    """
+    n %= N
+    c1 = (_B2 * n + N // 2) // N
+    c2 = (-_B1 * n + N // 2) // N
+    return n - c1 * _A1 - c2 * _A2, -c1 * _B1 - c2 * _B2
+
+def _add_digit(acc, table, d):
+    if d > 0:
+        return jacobian_add(acc, table[d >> 1])
+    x, y, z = table[-d >> 1]
+    return jacobian_add(acc, (x, P - y, z))
+
+class PrecomputedPoint:
+    r"""
+    Reusable precomputation for variable-base scalar multiplication of
+    `point`. Holds the odd multiples :math:`P, 3P, \ldots, (2^{w-1}-1)P`
+    used by the width-`w` NAF method, and their images under the secp256k1
+    endomorphism, so the cost of building them is paid once when the same
+    point is multiplied many times.
+    """
+    __slots__ = ('point', 'window', 'table', 'endo_table')
+
+    def __init__(self, point, w=5):
+        self.point = point
+        self.window = w
+        p = (point.jac if isinstance(point, JacobianPoint)
+             else to_jacobian(point))
+        dbl = jacobian_double(p)
+        table = [p]
+        for _ in range(2 ** (w - 2) - 1):
+            table.append(jacobian_add(table[-1], dbl))
+        self.table = tuple(table)
+        self.endo_table = tuple((BETA * x % P, y, z) for x, y, z in table)
+
+    def wnaf_multiply(self, n):
+        'Return `n` times the point in Jacobian coordinates using plain wNAF'
+        table = self.table
+        acc = (0, 0, 1)
+        for d in reversed(wnaf(n % N, self.window)):
+            acc = jacobian_double(acc)
+            if d:
+                acc = _add_digit(acc, table, d)
+        return acc
+
+    def streams(self, n):
+        """
+        Return the signed wNAF digit streams of the two :func:`glv_split`
+        halves of `n`, each paired with the table it indexes
+        """
+        out = []
+        for k, table in zip(glv_split(n), (self.table, self.endo_table)):
+            if k:
+                digits = wnaf(abs(k), self.window)
+                out.append(([-d for d in digits] if k < 0 else digits, table))
+        return out
+
+    def multiply(self, n):
+        """
+        Return `n` times the point in Jacobian coordinates. The scalar is
+        split with :func:`glv_split` and both halves are processed together
+        in one pass of shared doublings (Shamir's trick).
+        """
+        return _interleave(self.streams(n))
+
+def _interleave(streams):
+    'Sum of wNAF digit streams over their tables using shared doublings'
+    width = max((len(d) for d, _ in streams), default=0)
+    acc = (0, 0, 1)
+    for i in range(width - 1, -1, -1):
+        acc = jacobian_double(acc)
+        for digits, table in streams:
+            if i < len(digits) and digits[i]:
+                acc = _add_digit(acc, table, digits[i])
+    return acc
+
+#: Bits per window of the fixed-base generator table
+GTABLE_WINDOW = 4
+#: SHA256 of the serialized generator table, checked by :func:`load_gtable`
+GTABLE_DIGEST = \
+    "32954bcde546b36770f22617308bf7aa37357e073975557cac12489d87dd813a"
+_gtable = None
+
+def _build_gtable():
+    r"""
+    Build the fixed-base table for G. Row `r` holds the affine points
+    :math:`d \cdot 2^{wr} G` for each nonzero window digit `d`.
+    """
+    rows = []
+    base = (GX, GY, 1)
+    for _ in range(-(-256 // GTABLE_WINDOW)):
+        row = [base]
+        for _ in range(2 ** GTABLE_WINDOW - 2):
+            row.append(jacobian_add(row[-1], base))
+        base = jacobian_add(row[-1], base)
+        rows.append(row)
+    pts = batch_from_jacobian([p for row in rows for p in row])
+    width = 2 ** GTABLE_WINDOW - 1
+    return tuple(tuple(pts[i:i + width]) for i in range(0, len(pts), width))
+
+def save_gtable(path):
+    """
+    Write the fixed-base generator table to file `path`. The table is
+    written to a temporary file that then replaces `path`, so concurrent
+    readers never see a partial table.
+    """
+    b = b''.join(x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
+                 for row in gtable() for x, y in row)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def load_gtable(path):
+    """
+    Read a fixed-base generator table written by :func:`save_gtable` from file
+    `path` and install it as the process-wide table. Raises
+    :class:`ValueError` if the file does not hold the correct table.
+    """
+    global _gtable
+    width = 2 ** GTABLE_WINDOW - 1
+    with open(path, 'rb') as fd:
+        b = fd.read()
+    if len(b) != 64 * width * -(-256 // GTABLE_WINDOW):
+        raise ValueError("bad generator table size")
+    if hashlib.sha256(b).hexdigest() != GTABLE_DIGEST:
+        raise ValueError("bad generator table data")
+    pts = [(int.from_bytes(b[i:i + 32], 'big'),
+            int.from_bytes(b[i + 32:i + 64], 'big'))
+           for i in range(0, len(b), 64)]
+    _gtable = tuple(tuple(pts[i:i + width])
+                    for i in range(0, len(pts), width))
+    return _gtable
+
+def gtable():
+    """
+    Return the fixed-base generator table, building it on first use. If the
+    environment variable ``SORZUN_GTABLE`` names a file, the table is loaded
+    from there. If that file is missing, unreadable or invalid, the table is
+    built in memory and saved there on a best-effort basis.
+    """
+    global _gtable
+    if _gtable is None:
+        path = os.environ.get('SORZUN_GTABLE')
+        if path:
+            try:
+                return load_gtable(path)
+            except (OSError, ValueError):
+                pass
+        _gtable = _build_gtable()
+        if path:
+            try:
+                save_gtable(path)
+            except OSError:
+                pass
+    return _gtable
+
+def fixed_base_multiply(n):
+    'Return :math:`nG` in Jacobian coordinates using the precomputed table'
+    n %= N
+    mask = 2 ** GTABLE_WINDOW - 1
+    acc = (0, 0, 1)
+    for row in gtable():
+        if not n:
+            break
+        d = n & mask
+        if d:
+            acc = jacobian_add_affine(acc, row[d - 1])
+        n >>= GTABLE_WINDOW
+    return acc
+
+#: Number of terms above which :func:`multi_mul` switches to Pippenger
+PIPPENGER_THRESHOLD = 32
+
+def _straus(terms):
+    streams = []
+    for n, pt in terms:
+        streams += PrecomputedPoint(pt, 4).streams(n)
+    return _interleave(streams)
+
+def _pippenger(terms):
+    halves = []
+    for n, (x, y) in terms:
+        k1, k2 = glv_split(n)
+        for k, pt in ((k1, (x, y)), (k2, (BETA * x % P, y))):
+            if k:
+                halves.append((-k, (pt[0], P - pt[1])) if k < 0 else (k, pt))
+    c = max(2, len(halves).bit_length() - 3)
+    mask = (1 << c) - 1
+    bits = max((k.bit_length() for k, _ in halves), default=0)
+    acc = (0, 0, 1)
+    for shift in range((bits - 1) // c * c, -1, -c):
+        for _ in range(c):
+            acc = jacobian_double(acc)
+        buckets = [(0, 0, 1)] * (mask + 1)
+        for k, pt in halves:
+            d = (k >> shift) & mask
+            if d:
+                buckets[d] = jacobian_add_affine(buckets[d], pt)
+        running = total = (0, 0, 1)
+        for b in reversed(buckets[1:]):
+            running = jacobian_add(running, b)
+            total = jacobian_add(total, running)
+        acc = jacobian_add(acc, total)
+    return acc
+
+def jacobian_multi_mul(terms):
+    """
+    Return :math:`\\sum_i n_i P_i` in Jacobian coordinates for an iterable of
+    ``(scalar, point)`` pairs. Terms on the generator are folded into one
+    fixed-base multiplication and unit scalars into plain additions. The
+    remaining terms share one doubling chain: Straus' interleaved wNAF
+    method for small inputs and Pippenger's bucket method for large ones.
+    """
+    gsum = 0
+    acc = (0, 0, 1)
+    rest = []
+    for n, pt in terms:
+        if isinstance(pt, JacobianPoint):
+            pt = pt.to_point()
+        n %= N
+        if not n or not pt[1]:
+            continue
+        if pt == G:
+            gsum += n
+        elif n == 1:
+            acc = jacobian_add_affine(acc, pt)
+        else:
+            rest.append((n, pt))
+    if rest:
+        mul = _straus if len(rest) <= PIPPENGER_THRESHOLD else _pippenger
+        acc = jacobian_add(acc, mul(rest))
+    return jacobian_add(acc, fixed_base_multiply(gsum))
+
+def multi_mul(terms):
+    """
+    Return the :class:`Point` :math:`\\sum_i n_i P_i` for an iterable of
+    ``(scalar, point)`` pairs. See :func:`jacobian_multi_mul`.
+    """
+    return Point(*from_jacobian(jacobian_multi_mul(terms)))
+
 class Point(namedtuple('Point', 'x, y')):
 
     @classmethod
@@ -81,17 +397,32 @@ def from_priv(cls, prv):
     def from_bytes(cls, b):
         'returns a Point from a SEC1 compressed encoded byte sequence'
         x = int.from_bytes(b[1:33], 'big')
-        beta = pow(int(x*x*x+A*x+B), int((P+1)//4), int(P))
+        beta = sqrt((x * x * x + A * x + B) % P)
         y = (P-beta) if ((beta + b[0]) % 2) else beta
         return cls(x, y)
 
     def __mul__(self, n):
-        return Point(
-            *from_jacobian(jacobian_multiply(to_jacobian(self), n)))
+        if self == G:
+            return Point(*from_jacobian(fixed_base_multiply(n)))
+        return Point(*from_jacobian(PrecomputedPoint(self).multiply(n)))
+
+    def batch_mul(self, scalars):
+        """
+        Return a list of this point multiplied by each of `scalars`. The
+        products share one precomputation and are normalized to affine
+        coordinates together with :func:`batch_from_jacobian`.
+        """
+        if self == G:
+            mul = fixed_base_multiply
+        else:
+            mul = PrecomputedPoint(self).multiply
+        pts = batch_from_jacobian([mul(n) for n in scalars])
+        return [Point(*p) for p in pts]
 
     def __add__(self, b):
-        return Point(
-            *from_jacobian(jacobian_add(to_jacobian(self), to_jacobian(b))))
+        if isinstance(b, JacobianPoint):
+            return b + self
+        return Point(*from_jacobian(jacobian_add_affine(to_jacobian(self), b)))
 
     def __bytes__(self):
         'SEC1 compressed-form byte encoding of the Point as an ECDSA pubkey.'
@@ -101,4 +432,66 @@ def __bytes__(self):
     def __str__(self):
         return bytes(self).hex()
 
+class JacobianPoint:
+    """
+    A curve point held in Jacobian coordinates ``(X, Y, Z)``. Addition and
+    multiplication stay in Jacobian form, so chains of arithmetic need no
+    modular inversion. The affine :class:`Point` is computed only when
+    :attr:`x`, :attr:`y` or ``bytes()`` are needed, and is then cached.
+    Adding an affine :class:`Point` uses mixed Jacobian+affine addition.
+    """
+    __slots__ = ('jac', '_affine')
+
+    def __init__(self, X, Y, Z=1):
+        self.jac = (X, Y, Z)
+        self._affine = Point(X, Y) if Z == 1 else None
+
+    @classmethod
+    def from_priv(cls, prv):
+        'Return :math:`prv \\cdot G` using the fixed-base generator table'
+        return cls(*fixed_base_multiply(prv))
+
+    def to_point(self):
+        'Return the affine :class:`Point`'
+        if self._affine is None:
+            self._affine = Point(*from_jacobian(self.jac))
+        return self._affine
+
+    @property
+    def x(self):
+        return self.to_point().x
+
+    @property
+    def y(self):
+        return self.to_point().y
+
+    def __add__(self, b):
+        if isinstance(b, JacobianPoint):
+            return JacobianPoint(*jacobian_add(self.jac, b.jac))
+        return JacobianPoint(*jacobian_add_affine(self.jac, b))
+
+    __radd__ = __add__
+
+    def __mul__(self, n):
+        if self._affine == G:
+            return JacobianPoint(*fixed_base_multiply(n))
+        return JacobianPoint(*PrecomputedPoint(self).multiply(n))
+
+    def __eq__(self, b):
+        if isinstance(b, JacobianPoint):
+            b = b.to_point()
+        return self.to_point() == b
+
+    def __hash__(self):
+        return hash(self.to_point())
+
+    def __bytes__(self):
+        return bytes(self.to_point())
+
+    def __str__(self):
+        return bytes(self).hex()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.jac}"
+
 G = Point(GX, GY)
@@ -0,0 +1,74 @@
+"""
+Arithmetic in the secp256k1 base field :math:`GF(P)`. The fastest
+available primitives are picked at import time: gmpy2_ if it is installed,
+otherwise the builtin :func:`pow` (which computes modular inverses natively
+on Python 3.8+), otherwise a pure Python extended Euclid loop. Use
+:func:`backend` to see which one is in effect.
+
+.. _gmpy2: https://gmpy2.readthedocs.io
+"""
+
+import sys
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+#: secp256k1 field prime
+P = 2 ** 256 - 2 ** 32 - 977
+
+# P = 3 (mod 4), so a square root of a is a ** ((P + 1) / 4)
+_SQRT_EXP = (P + 1) // 4
+
+def _inv_euclid(a, n):
+    if a == 0:
+        return 0
+    lm, hm = 1, 0
+    low, high = a % n, n
+    while low > 1:
+        r = high//low
+        nm, new = hm - lm * r, high - low * r
+        lm, low, hm, high = nm, new, lm, low
+    return lm % n
+
+if gmpy2 is not None:
+    _BACKEND = 'gmpy2'
+
+    def inv(a: int, n: int = P) -> int:
+        "Modular inverse of `a` mod `n`. Returns 0 if `a` is 0 mod `n`"
+        return int(gmpy2.invert(a, n)) if a % n else 0
+
+    def sqrt(a: int) -> int:
+        """
+        Return a square root of `a` mod :data:`P`. The result is only
+        meaningful if `a` is a quadratic residue.
+        """
+        return int(gmpy2.powmod(a, _SQRT_EXP, P))
+
+elif sys.version_info >= (3, 8):
+    _BACKEND = 'builtin'
+
+    def inv(a: int, n: int = P) -> int:
+        "Modular inverse of `a` mod `n`. Returns 0 if `a` is 0 mod `n`"
+        return pow(a, -1, n) if a % n else 0
+
+else:
+    _BACKEND = 'python'
+    inv = _inv_euclid
+
+if gmpy2 is None:
+
+    def sqrt(a: int) -> int:
+        """
+        Return a square root of `a` mod :data:`P`. The result is only
+        meaningful if `a` is a quadratic residue.
+        """
+        return pow(a, _SQRT_EXP, P)
+
+def backend() -> str:
+    """
+    Name of the arithmetic backend in use: ``'gmpy2'``, ``'builtin'`` or
+    ``'python'``
+    """
+    return _BACKEND
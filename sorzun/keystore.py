@@ -0,0 +1,152 @@
+"""
+Compact columnar storage for large numbers of derived public keys. A key
+store file holds the children of one parent node as fixed-width columns:
+33-byte SEC1 public keys, 32-byte chaincodes, 20-byte HASH160 key ids and
+4-byte big endian child indices. :class:`KeyStore` memory-maps the file and
+exposes the columns as :class:`memoryview` slices, creating
+:class:`~sorzun.deterministic.PubBIP32Node` objects only when asked to.
+"""
+
+import mmap
+import struct
+from collections.abc import Sized
+from itertools import islice
+
+from .deterministic import PubBIP32Node
+from .ecc import Point
+from .parallel import derive_range
+
+_HEADER = struct.Struct(">4sQB4s")
+_MAGIC = b"SZKS"
+#: Column widths in bytes: SEC1 pubkey, chaincode, HASH160, index
+COLUMNS = (33, 32, 20, 4)
+
+def _children(parent, indices, chunk):
+    it = iter(indices)
+    while True:
+        kids = parent.children(islice(it, chunk))
+        if not kids:
+            return
+        yield from kids
+
+def write_keystore(path, parent, indices, chunk: int = 4096,
+                   workers: int = None) -> int:
+    """
+    Derive the children of `parent` at `indices` with
+    :meth:`~sorzun.deterministic.XPubKey.children`, `chunk` at a time, and
+    write them to a key store file at `path`. If `workers` is given the
+    children are derived by that many processes with
+    :func:`~sorzun.parallel.derive_range`. Returns the number of keys
+    written. The number of keys must be known up front, so `indices` should
+    be a sized collection such as a :class:`range`; other iterables are
+    read into a list first.
+    """
+    if not isinstance(indices, Sized):
+        indices = list(indices)
+    n = len(indices)
+    offsets = [_HEADER.size]
+    for width in COLUMNS[:-1]:
+        offsets.append(offsets[-1] + width * n)
+    with open(path, "wb") as fd:
+        fd.write(_HEADER.pack(_MAGIC, n, parent.depth + 1, parent.fingerprint))
+        fd.truncate(offsets[-1] + COLUMNS[-1] * n)
+        nodes = (derive_range(parent, indices, workers, chunk) if workers
+                 else _children(parent, indices, chunk))
+        done = 0
+        while done < n:
+            kids = list(islice(nodes, chunk))
+            if not kids:
+                raise ValueError("fewer indices than their reported length")
+            cols = (b"".join(k.sec for k in kids),
+                    b"".join(k.chaincode for k in kids),
+                    b"".join(k.id for k in kids),
+                    b"".join(k.index.to_bytes(4, "big") for k in kids))
+            for off, width, data in zip(offsets, COLUMNS, cols):
+                fd.seek(off + width * done)
+                fd.write(data)
+            done += len(kids)
+    return n
+
+class KeyStore:
+    """
+    Read-only, memory-mapped view of a key store file written by
+    :func:`write_keystore`. The :attr:`pubkeys`, :attr:`chaincodes`,
+    :attr:`hash160s` and :attr:`indices` attributes are zero-copy
+    :class:`memoryview` columns. Indexing or iterating the store yields
+    :class:`~sorzun.deterministic.PubBIP32Node` objects, built on demand.
+
+    Any views taken from the column attributes must be released before the
+    store is closed, otherwise :meth:`close` raises :class:`BufferError`.
+    The per-key accessors such as :meth:`sec` return :class:`bytes` copies
+    and do not hold the file open.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as fd:
+            self._mm = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            self._mm.close()
+            raise ValueError("not a key store file")
+        magic, n, self.depth, self.parent_fingerprint = \
+            _HEADER.unpack_from(self._mm)
+        if magic != _MAGIC:
+            self._mm.close()
+            raise ValueError("not a key store file")
+        if len(self._mm) != _HEADER.size + sum(COLUMNS) * n:
+            self._mm.close()
+            raise ValueError("key store file size does not match its header")
+        self._n = n
+        mv = memoryview(self._mm)
+        cols, off = [], _HEADER.size
+        for width in COLUMNS:
+            cols.append(mv[off:off + width * n])
+            off += width * n
+        self._views = [mv] + cols
+        self.pubkeys, self.chaincodes, self.hash160s, self.indices = cols
+
+    def close(self):
+        """
+        Release the column views and unmap the file. Raises
+        :class:`BufferError` if views derived from the columns are still held
+        elsewhere; the call can be repeated once they are released.
+        """
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._n
+
+    def sec(self, i: int) -> bytes:
+        "SEC1 public key bytes of the `i`:superscript:`th` key"
+        return self.pubkeys[33 * i:33 * i + 33].tobytes()
+
+    def chaincode(self, i: int) -> bytes:
+        "Chaincode of the `i`:superscript:`th` key"
+        return self.chaincodes[32 * i:32 * i + 32].tobytes()
+
+    def hash160(self, i: int) -> bytes:
+        "HASH160 key id of the `i`:superscript:`th` key"
+        return self.hash160s[20 * i:20 * i + 20].tobytes()
+
+    def index(self, i: int) -> int:
+        "Child index of the `i`:superscript:`th` key"
+        return int.from_bytes(self.indices[4 * i:4 * i + 4], "big")
+
+    def __getitem__(self, i: int) -> PubBIP32Node:
+        if not -self._n <= i < self._n:
+            raise IndexError("key store index out of range")
+        i %= self._n
+        return PubBIP32Node(Point.from_bytes(self.sec(i)),
+                            self.chaincode(i), self.depth,
+                            self.parent_fingerprint, self.index(i))
+
+    def __iter__(self):
+        return (self[i] for i in range(self._n))
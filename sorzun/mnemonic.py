@@ -6,15 +6,27 @@
 
 import hashlib
 import os
+from collections import deque, namedtuple
+from collections.abc import Mapping
+from itertools import repeat
+from time import perf_counter
 from unicodedata import normalize as _normalize
 
-from .util import convertbits
+try:
+    from functools import cached_property
+except ImportError:
+    from .util import cached_property
 
 class _WordList(tuple):
     """
     A tuple word list with a compact repr. Useable as a full language word-list
     tuple but doesn't spam the screen when printed in documentation. This must
     be loaded from a text file.
+
+    Membership tests and :meth:`index` use a precomputed word to index map
+    (:attr:`indices`) instead of scanning the tuple. :attr:`prefixes` maps
+    each unambiguous 4-character word prefix to its word index, for
+    resolving abbreviated words with :meth:`expand`.
     """
 
     def __new__(cls, fn):
@@ -28,13 +40,80 @@ def __new__(cls, fn):
 
     def __init__(self, fn):
         self.filename = fn
+        self.indices = {word: i for i, word in enumerate(self)}
+
+    @cached_property
+    def prefixes(self):
+        prefixes = {}
+        for i, word in enumerate(self):
+            prefixes[word[:4]] = None if word[:4] in prefixes else i
+        return {p: i for p, i in prefixes.items() if i is not None}
+
+    def __contains__(self, word):
+        return word in self.indices
+
+    def index(self, word):
+        "Return the index of `word` in the word list"
+        try:
+            return self.indices[word]
+        except KeyError:
+            raise ValueError(f"{word!r} is not in word list") from None
+
+    def expand(self, abbrev: str) -> str:
+        """
+        Return the word that `abbrev` (a word, or a prefix of it at least 4
+        characters long) stands for. Raises :class:`ValueError` if it is not
+        a word or an unambiguous prefix of one.
+        """
+        word = self._resolve(abbrev)
+        if word not in self.indices:
+            raise ValueError(f"{abbrev!r} does not identify a word")
+        return word
+
+    def _resolve(self, abbrev: str) -> str:
+        "Like :meth:`expand`, but return `abbrev` unchanged if it is unknown"
+        if abbrev in self.indices:
+            return abbrev
+        i = self.prefixes.get(abbrev[:4]) if len(abbrev) >= 4 else None
+        if i is None or not self[i].startswith(abbrev):
+            return abbrev
+        return self[i]
 
     def __repr__(self):
         return self.__class__.__name__ + f"(\"{self.filename}\")"
 
+class _WordLists(Mapping):
+    """
+    Read-only mapping of language name to :class:`_WordList`. Each word list
+    is loaded from its text file the first time it is looked up.
+    """
+
+    def __init__(self, langs):
+        self._langs = tuple(langs)
+        self._loaded = {}
+
+    def __getitem__(self, lang):
+        try:
+            return self._loaded[lang]
+        except KeyError:
+            if lang not in self._langs:
+                raise
+        wl = self._loaded[lang] = _WordList(f"wordlists/{lang}.txt")
+        return wl
+
+    def __iter__(self):
+        return iter(self._langs)
+
+    def __len__(self):
+        return len(self._langs)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._langs)})"
+
 #: Languages supported by this module
 LANGS = ["english", "japanese", "french", "italian", "korean", "spanish"]
-WORDLISTS = {lang : _WordList(f"wordlists/{lang}.txt") for lang in LANGS}
+#: Word list of each language in :data:`LANGS`, loaded on first access
+WORDLISTS = _WordLists(LANGS)
 
 class Mnemonic(tuple):
     """
@@ -57,7 +136,9 @@ class Mnemonic(tuple):
     automatically validity-checked at construction time for these validity
     critera making it difficult to have an invalid :class:`Mnemonic` instance.
     If :class:`Mnemonic` is called with invalid initialization data, an
-    Exception with a descriptive error message is raised.
+    Exception with a descriptive error message is raised. Words may be
+    abbreviated to any unambiguous prefix of at least 4 characters; they are
+    expanded to the full words of the wordlist.
 
     args:
         data (flexible): Data to use to initialize the mnemonic.
@@ -112,7 +193,8 @@ def __new__(cls, data=20, lang="english"):
             return cls._from_entropy(data, lang)
         if isinstance(data, str):
             return cls(_normalize("NFKD", data).split(), lang)
-        return super().__new__(cls, data)
+        resolve = WORDLISTS[lang]._resolve
+        return super().__new__(cls, (resolve(x) for x in data))
 
     def __init__(self, data=20, lang="english"):
         self.language = lang
@@ -146,15 +228,44 @@ def to_seed(self, password: bytes = b'') -> bytes:
         >>> m.to_seed(b"some_password")
         b'?\xb8\x18\x8a\xd5meE\x89\x08~\xfd_d\xcc6\x00\xe0\xb2(\xab\xd4\x1a\xb6\xb9ky\x93>\xe1\x9a~\x05e\xb0\xc1(R\xd6\xf6|\xab\x1a\x06\xd9j\xf7Wp,\xe5>\xa5$\xc6\xb6\xc5\x1f\xf3k\xa2F\x8a\xcb'
         """
-        mnemonic_bytes = str(self).encode()
-        return hashlib.pbkdf2_hmac(hash_name='sha512',
-                                   password=mnemonic_bytes,
-                                   salt=b'mnemonic' + password,
-                                   iterations=2048)
+        return _pbkdf2(str(self).encode(), password)
 
     def _bin_string(self) -> str:
         'return str of binary representation'
-        return ''.join(bin(self.wordlist.index(x))[2:].zfill(11) for x in self)
+        return bin(self._to_int())[2:].zfill(11 * len(self))
+
+    def _to_int(self) -> int:
+        'return entropy and checksum bits as one integer'
+        idx = self.wordlist.indices
+        n = 0
+        for x in self:
+            n = (n << 11) | idx[x]
+        return n
+
+    def to_entropy(self) -> bytes:
+        r"""
+        Return the entropy bytes carried by the mnemonic. This is the inverse
+        of constructing a :class:`Mnemonic` from :class:`bytes`.
+
+        >>> Mnemonic(b'\x1d\x12\xbf\xae"\xcc&w\xa2I\xab>\x8d\n\xdfk').to_entropy()
+        b'\x1d\x12\xbf\xae"\xcc&w\xa2I\xab>\x8d\n\xdfk'
+        """
+        cs = len(self) // 3
+        return (self._to_int() >> cs).to_bytes(4 * cs, 'big')
+
+    def to_indices(self) -> list:
+        'Return the list of word list indices of the words'
+        idx = self.wordlist.indices
+        return [idx[x] for x in self]
+
+    @classmethod
+    def from_indices(cls, indices, lang="english"):
+        """
+        Create a Mnemonic from a sequence of word list indices. The result is
+        validity-checked like any other :class:`Mnemonic`.
+        """
+        wl = WORDLISTS[lang]
+        return cls(tuple(wl[i] for i in indices), lang)
 
     @classmethod
     def _from_entropy(cls, ent, lang):
@@ -168,12 +279,12 @@ def _from_entropy(cls, ent, lang):
         assert len(ent) % 4 == 0 and len(ent) >= 16 and len(ent) <= 32,\
             'entropy length must be integer multiple of 32 between 128-256'
 
-        hash_ = hashlib.sha256(ent).digest()
-        chk = convertbits(hash_, 8, 1)[:ENT // 32]
-        entbits = convertbits(ent, 8, 1)
-        full = entbits + chk
-        l = convertbits(full, 1, 11)
-        return cls(tuple(wl[x] for x in l), lang)
+        cs = ENT // 32
+        chk = hashlib.sha256(ent).digest()[0] >> (8 - cs)
+        full = (int.from_bytes(ent, 'big') << cs) | chk
+        nwords = (ENT + cs) // 11
+        return cls(tuple(wl[(full >> 11 * k) & 0x7FF]
+                         for k in range(nwords - 1, -1, -1)), lang)
 
     def _check(self):
         """
@@ -186,18 +297,74 @@ def _check(self):
                              "21, or 24 words"
             )
 
-        if not all(x in self.wordlist for x in self):
-            baditems = frozenset(self) - frozenset(self.wordlist)
+        idx = self.wordlist.indices
+        if not all(x in idx for x in self):
+            baditems = frozenset(x for x in self if x not in idx)
             raise ValueError(
                 "Bad word(s): the following words are not "
                 "present in the wordlist: " f"{list(baditems)}"
             )
 
-        l = [self.wordlist.index(x) for x in self]
-        fullbits = convertbits(l, 11, 1)
-        ENT = 32 * len(fullbits) // 33
-        plbits, csbits = fullbits[:ENT], fullbits[ENT:]
-        plbytes = bytes(convertbits(plbits, 1, 8))
-        hash_ = hashlib.sha256(plbytes).digest()
-        if not convertbits(hash_, 8, 1)[:len(csbits)] == csbits:
+        full = self._to_int()
+        cs = len(self) // 3
+        plbytes = (full >> cs).to_bytes(4 * cs, 'big')
+        chk = hashlib.sha256(plbytes).digest()[0] >> (8 - cs)
+        if chk != full & ((1 << cs) - 1):
             raise ValueError("Bad mnemonic checksum")
+
+SeedResult = namedtuple("SeedResult", "mnemonic seed elapsed")
+
+def _pbkdf2(mnemonic: bytes, password: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac(hash_name='sha512',
+                               password=mnemonic,
+                               salt=b'mnemonic' + password,
+                               iterations=2048)
+
+def _seed_chunk(jobs):
+    "Return (seed, elapsed) for each (mnemonic bytes, password) in `jobs`"
+    ret = []
+    for m, password in jobs:
+        t = perf_counter()
+        seed = _pbkdf2(m, password)
+        ret.append((seed, perf_counter() - t))
+    return ret
+
+def seeds_many(mnemonics, passwords=b'', workers: int = None,
+               threads: bool = True, chunk: int = 64, lang="english"):
+    """
+    Lazily compute :meth:`Mnemonic.to_seed` for each of `mnemonics` and yield
+    :class:`SeedResult` tuples ``(mnemonic, seed, elapsed)`` in input order,
+    where `elapsed` is the time in seconds spent in PBKDF2 for that seed.
+
+    Items of `mnemonics` may be :class:`Mnemonic` instances or anything the
+    constructor accepts in language `lang`. They are validated as they are
+    read, so an invalid mnemonic raises :class:`ValueError` part way
+    through, possibly after seeds for earlier ones have been yielded.
+    `passwords` is either a single :class:`bytes` password used for every
+    mnemonic or an iterable of them paired with `mnemonics`, which must have
+    the same length. The work runs in `workers` threads (PBKDF2 releases the
+    GIL) or, if `threads` is false, in `workers` processes. A `workers`
+    value of 1 computes the seeds in the calling thread.
+    """
+    paired = not isinstance(passwords, bytes)
+    passwords = iter(passwords) if paired else repeat(passwords)
+    pending = deque()
+    def jobs():
+        for m in mnemonics:
+            password = next(passwords, None)
+            if password is None:
+                raise ValueError("fewer passwords than mnemonics")
+            if not isinstance(m, Mnemonic):
+                m = Mnemonic(m, lang)
+            pending.append(m)
+            yield str(m).encode(), password
+        if paired and next(passwords, None) is not None:
+            raise ValueError("more passwords than mnemonics")
+    from .util import pool_map
+
+    if workers == 1:
+        results = (x for job in jobs() for x in _seed_chunk([job]))
+    else:
+        results = pool_map(_seed_chunk, jobs(), workers, chunk, threads)
+    for seed, elapsed in results:
+        yield SeedResult(pending.popleft(), seed, elapsed)
@@ -0,0 +1,40 @@
+"""
+Multi-process BIP32 key derivation. Derivation is CPU-bound pure Python, so
+large index ranges are sharded across a pool of worker processes with
+:func:`derive_range`. Workers receive the parent node as its compact BIP32
+string and send back raw key material, so no node objects are pickled in
+either direction.
+"""
+
+from functools import partial
+
+from .deterministic import node_from_str, PrivBIP32Node
+from .ecc import Point
+from .util import pool_map
+
+def _derive_chunk(xkey: str, indices: list) -> list:
+    node = node_from_str(xkey)
+    children = node.children(indices)
+    if isinstance(node, PrivBIP32Node):
+        return [(c.keydata, c.chaincode, c.index) for c in children]
+    return [(c.keydata.x, c.keydata.y, c.chaincode, c.index)
+            for c in children]
+
+def derive_range(node, indices, workers: int = None, chunk: int = 4096):
+    """
+    Derive the children of BIP32 node `node` at each of `indices` using a
+    pool of `workers` processes (default: one per CPU). `indices` is split
+    into shards of `chunk` indices. This is a generator: children are
+    yielded in the order of `indices` as their shards complete, and at most
+    two shards per worker are in flight at a time. The results are
+    identical to ``node.children(indices)``.
+    """
+    xkey = node.xprv if isinstance(node, PrivBIP32Node) else node.xpub
+    cls, depth, finger = type(node), node.depth + 1, node.fingerprint
+    results = pool_map(partial(_derive_chunk, xkey), indices, workers, chunk)
+    if isinstance(node, PrivBIP32Node):
+        for k, cc, i in results:
+            yield cls(k, cc, depth, finger, i)
+    else:
+        for x, y, cc, i in results:
+            yield cls(Point(x, y), cc, depth, finger, i)
@@ -0,0 +1,128 @@
+"""
+BIP44_ account discovery. Accounts are walked in order, and the external and
+internal chains of each are derived in batches. Each batch of addresses is
+passed to a user-supplied "is used" oracle, and a chain ends after
+`gap_limit` consecutive unused addresses. Discovery stops at the first
+account whose external chain has no used addresses.
+
+The oracle is called with a list of query items (by default the HASH160 key
+id of each address, see the `key` argument) and must return a sequence of
+truthy/falsy values of the same length, otherwise :class:`ValueError` is
+raised. :func:`scan_account` and
+:func:`discover` take a plain function; :func:`ascan_account` and
+:func:`adiscover` are coroutines that also accept an oracle returning an
+awaitable.
+
+.. _BIP44: https://github.com/bitcoin/bips/blob/master/bip-0044.mediawiki
+"""
+
+import inspect
+import time
+from collections import namedtuple
+
+#: Result of scanning one chain. `used` is the list of used indices,
+#: `derived` the number of addresses derived, and `derive_time` and
+#: `query_time` the seconds spent deriving and waiting on the oracle.
+ChainResult = namedtuple("ChainResult",
+    "account chain used derived derive_time query_time")
+
+def _hash160(node):
+    return node.id
+
+def _scan_chain(node, account, chain, gap_limit, batch, key):
+    used = []
+    start = 0
+    derive_time = query_time = 0.0
+    while start - (used[-1] + 1 if used else 0) < gap_limit:
+        t0 = time.perf_counter()
+        kids = node.ckd_range(start, start + batch)
+        query = [key(k) for k in kids]
+        t1 = time.perf_counter()
+        flags = list((yield query))
+        if len(flags) != len(query):
+            raise ValueError(f"oracle returned {len(flags)} results for "
+                             f"{len(query)} queries")
+        derive_time += t1 - t0
+        query_time += time.perf_counter() - t1
+        used += [k.index for k, f in zip(kids, flags) if f]
+        start += batch
+    return ChainResult(account, chain, used, start, derive_time, query_time)
+
+def _scan_account(account, number, gap_limit, batch, chains, key):
+    results = []
+    for chain in chains:
+        results.append((yield from _scan_chain(
+            account.ckd(chain), number, chain, gap_limit, batch, key)))
+    return results
+
+def _discover(root, coin, purpose, gap_limit, batch, key):
+    results = []
+    number = 0
+    while True:
+        account = root.derive(f"{purpose}H/{coin}H/{number}H")
+        external = yield from _scan_chain(
+            account.ckd(0), number, 0, gap_limit, batch, key)
+        results.append(external)
+        if not external.used:
+            return results
+        results.append((yield from _scan_chain(
+            account.ckd(1), number, 1, gap_limit, batch, key)))
+        number += 1
+
+def _run(steps, is_used):
+    try:
+        query = next(steps)
+        while True:
+            query = steps.send(is_used(query))
+    except StopIteration as e:
+        return e.value
+
+async def _arun(steps, is_used):
+    try:
+        query = next(steps)
+        while True:
+            flags = is_used(query)
+            if inspect.isawaitable(flags):
+                flags = await flags
+            query = steps.send(flags)
+    except StopIteration as e:
+        return e.value
+
+def scan_account(account, is_used, gap_limit: int = 20, batch: int = None,
+                 chains=(0, 1), key=_hash160, number: int = 0) -> list:
+    """
+    Scan the chains `chains` of account-level BIP32 node `account`, which
+    may be public. Addresses are derived `batch` at a time (default:
+    `gap_limit`) and each batch is mapped through `key` and passed to the
+    oracle `is_used`. Returns a list of :class:`ChainResult`, one per
+    chain, labelled with account number `number`.
+    """
+    steps = _scan_account(
+        account, number, gap_limit, batch or gap_limit, chains, key)
+    return _run(steps, is_used)
+
+def discover(root, is_used, coin: int = 0, purpose: int = 44,
+             gap_limit: int = 20, batch: int = None, key=_hash160) -> list:
+    """
+    Run BIP44 account discovery from private master node `root` for coin
+    type `coin`, calling the oracle `is_used` with batches of query items.
+    Returns a list of :class:`ChainResult` for every chain scanned,
+    including the external chain of the final, unused account.
+    """
+    steps = _discover(root, coin, purpose, gap_limit, batch or gap_limit, key)
+    return _run(steps, is_used)
+
+async def ascan_account(account, is_used, gap_limit: int = 20,
+                        batch: int = None, chains=(0, 1), key=_hash160,
+                        number: int = 0) -> list:
+    "Coroutine version of :func:`scan_account`"
+    steps = _scan_account(
+        account, number, gap_limit, batch or gap_limit, chains, key)
+    return await _arun(steps, is_used)
+
+async def adiscover(root, is_used, coin: int = 0, purpose: int = 44,
+                    gap_limit: int = 20, batch: int = None,
+                    key=_hash160) -> list:
+    "Coroutine version of :func:`discover`"
+    steps = _discover(root, coin, purpose, gap_limit, batch or gap_limit, key)
+    return await _arun(steps, is_used)
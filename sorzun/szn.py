@@ -1,6 +1,7 @@
 import argparse
 import math
 from .deterministic import node_from_str, PrivBIP32Node
+from .parallel import derive_range
 from .mnemonic import Mnemonic
 
 def range_from_str(s):
@@ -19,6 +20,8 @@ def main():
                         Range of leaf indices to compute. Format is x-y. If
                         only one number is given x is assumed to be zero.
                         """)
+    parser.add_argument('-j', '--jobs', default=1, type=int,
+                        help='number of worker processes for leaf derivation')
     parser.add_argument('keydata', nargs='?', default=None,
                         help="""
                         Key specification. This can be a BIP32 standard xpub or
@@ -74,9 +77,9 @@ def main():
     # cashaddr abbreveation adjustment.
     ab = 12 if (args.long_bch_format and args.format == "BCH") else 0
     print(f"\n{'leaves':-<{ll + al + kl + ab + 2}}")
-    for i in args.l:
-        xkey = mend.ckd(i)
-
+    leaves = (derive_range(mend, args.l, args.jobs) if args.jobs > 1
+              else mend.children(args.l))
+    for i, xkey in zip(args.l, leaves):
         if args.format != "BCH":
             addr = xkey.addr(addrpre[args.format])
         elif args.long_bch_format:
@@ -85,7 +88,7 @@ def main():
             addr = xkey.cashaddr()[12:]
 
         keydat = (xkey.wif(wifpre[args.format]) if args.wif
-                  else bytes(xkey.pubkey).hex().upper())
+                  else xkey.sec.hex().upper())
         print(f"{i:{ll}d} {addr:<34} {keydat}")
 
 if __name__ == "__main__":
@@ -1,5 +1,12 @@
 "Small utility module for some common functions"
 
+import os
+from collections import OrderedDict, deque, namedtuple
+from itertools import islice
+from threading import Lock
+
+CacheStats = namedtuple("CacheStats", "hits misses evictions size maxsize")
+
 def convertbits(
         data: bytes, frombits: int, tobits: int, pad: bool=True
     ) -> bytes:
@@ -27,3 +34,145 @@ def convertbits(
     elif bits >= frombits or ((acc << (tobits - bits)) & maxv):
         return None
     return ret
+
+def pool_map(func, items, workers: int = None, chunk: int = 1024,
+             threads: bool = False):
+    """
+    Lazily map `func` over `items` in a pool of `workers` processes and
+    yield the results in input order. `items` is split into lists of
+    `chunk` items and `func` is called on each list, returning a list of
+    results. `func` must be picklable (e.g. a module-level function or a
+    :func:`functools.partial` of one). At most two chunks per worker are in
+    flight, so `items` can be an arbitrarily long stream. If `threads` is
+    true a thread pool is used instead, which only pays off when `func`
+    releases the GIL.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    it = iter(items)
+    pool = (ThreadPoolExecutor if threads else ProcessPoolExecutor)(workers)
+    pending = deque()
+    try:
+        while True:
+            part = list(islice(it, chunk))
+            if part:
+                pending.append(pool.submit(func, part))
+            if pending and (not part or len(pending) >= 2 * workers):
+                yield from pending.popleft().result()
+            elif not part:
+                break
+    finally:
+        for fut in pending:
+            fut.cancel()
+        pool.shutdown(wait=True)
+
+class cached_property:
+    """
+    Fallback for :func:`functools.cached_property` on Python < 3.8. The
+    wrapped method is called on first access and its value is stored in the
+    instance ``__dict__`` under the same name, shadowing the descriptor.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.attrname = None
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.attrname = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        d = instance.__dict__
+        try:
+            return d[self.attrname]
+        except KeyError:
+            value = d[self.attrname] = self.func(instance)
+            return value
+
+class LRUCache:
+    """
+    A bounded cache that evicts the least recently used entry once it holds
+    more than `maxsize` entries. A `maxsize` of 0 disables caching entirely.
+    Hit, miss and eviction counts are reported by :attr:`stats`. All methods
+    are safe to call from multiple threads.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        "Return the value cached for `key`, or `default` if there is none"
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def lookup(self, keys):
+        """
+        Return ``(i, value)`` for the first of `keys` that is cached, or
+        ``(None, None)`` if none are. Counts as a single hit or miss.
+        """
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return i, self._data[key]
+            self.misses += 1
+            return None, None
+
+    def put(self, key, value):
+        "Cache `value` under `key`, evicting old entries if needed"
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def remove_if(self, predicate):
+        "Drop every entry whose key satisfies `predicate`"
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def resize(self, maxsize: int):
+        "Change the size limit, evicting old entries if needed"
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        "Drop all entries and reset the statistics"
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def _evict(self):
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def stats(self) -> CacheStats:
+        "Current :class:`CacheStats` of the cache"
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions,
+                              len(self._data), self.maxsize)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
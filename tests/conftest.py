@@ -0,0 +1,30 @@
+import pytest
+
+from sorzun import deterministic
+from sorzun.deterministic import PrivBIP32Node
+
+@pytest.fixture(scope="session")
+def root():
+    "Private master node shared by the derivation tests"
+    return PrivBIP32Node.from_entropy(bytes(range(16)))
+
+@pytest.fixture(scope="session")
+def account(root):
+    "Private BIP44 account node m/44H/0H/0H of `root`"
+    return root.derive("44H/0H/0H")
+
+@pytest.fixture
+def memo(monkeypatch):
+    """
+    The :mod:`sorzun.deterministic` module, with its memo and derivation
+    cache settings restored and the caches cleared after the test
+    """
+    caches = (deterministic.derivation_cache, deterministic.pubkey_memo,
+              deterministic.sec_memo, deterministic.id_memo)
+    sizes = [cache.maxsize for cache in caches]
+    monkeypatch.setattr(deterministic, "cache_private",
+                        deterministic.cache_private)
+    yield deterministic
+    for cache, size in zip(caches, sizes):
+        cache.clear()
+        cache.resize(size)
@@ -0,0 +1,46 @@
+import pytest
+
+from sorzun.deterministic import node_from_str
+from sorzun.addrindex import AddressIndex, build_index, addr_hash160
+
+@pytest.fixture(scope="module")
+def accounts(root):
+    return [node_from_str(root.derive(f"44H/0H/{n}H").xpub) for n in range(2)]
+
+def test_build_and_lookup(tmp_path, accounts):
+    fn = tmp_path / "index.bin"
+    with build_index(fn, accounts, 10) as index:
+        assert len(index) == 40
+        leaf = accounts[1].derive("1/7")
+        assert index.lookup(leaf.addr()) == (1, 1, 7)
+        assert index.lookup(leaf.cashaddr()) == (1, 1, 7)
+        assert index.lookup(leaf.id) == (1, 1, 7)
+        assert index.lookup(accounts[0].derive("0/10").id) is None
+
+        index.extend(accounts[0], 0, 0, range(5, 20))
+        assert len(index) == 50
+        assert index.lookup(accounts[0].derive("0/15").addr()) == (0, 0, 15)
+    with AddressIndex(fn) as index:
+        assert len(index) == 50
+
+def test_build_incremental(tmp_path, accounts, monkeypatch):
+    fn = tmp_path / "index.bin"
+    calls = []
+    extend = AddressIndex.extend
+    def spy(self, node, number, chain, indices):
+        calls.append((number, chain, list(indices)))
+        extend(self, node, number, chain, indices)
+    monkeypatch.setattr(AddressIndex, "extend", spy)
+    build_index(fn, accounts[1:], 4, chains=(0,)).close()
+    assert calls == [(1, 0, [0, 1, 2, 3])]
+    calls.clear()
+    with build_index(fn, accounts, 6, chains=(0,)) as index:
+        assert calls == [(0, 0, list(range(6))), (1, 0, [4, 5])]
+        assert len(index) == 12
+        assert index.lookup(accounts[1].derive("0/5").id) == (1, 0, 5)
+    with pytest.raises(ValueError, match="hardened"):
+        build_index(fn, [accounts[0].ckd(0)], 1)
+
+def test_bad_address():
+    with pytest.raises(ValueError, match="not a HASH160"):
+        addr_hash160(b"\0" * 19)
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from sorzun.base58 import ALPHABET, b58enc, b58dec
+
+def _reference_enc(b):
+    i = int.from_bytes(b, 'big')
+    string = ''
+    while i:
+        i, idx = divmod(i, 58)
+        string += ALPHABET[idx]
+    return (string + '1' * (len(b) - len(b.lstrip(b'\0'))))[::-1]
+
+@pytest.fixture(scope="module")
+def payloads():
+    return [b"", b"\0", b"\0\0\1", bytes(range(256))] + [
+        b"\0" * (n % 3) + os.urandom(n) for n in range(1, 120)]
+
+def test_roundtrip(payloads):
+    for pl in payloads:
+        s = b58enc(pl)
+        assert s == _reference_enc(pl)
+        assert b58dec(s) == pl
+        assert b58dec(b58enc(pl, True), True) == pl
+
+def test_vectors():
+    txt = "The quick brown fox jumps over the lazy dog"
+    assert b58enc(txt) == ("7DdiPPYtxLjCD3wA1po2rvZHTDYjkZYiEtazrfiwJcwnKCizhG"
+                           "FhBGHeRdx")
+    assert b58dec("5yh1rWBFpZFGWaRyxxaZYsKsGfr1TFHc\n", True) == (
+        b"\xf0\xfcw\x99\xc0j\xadAN\xf6\x18\xcfT\x94\x91\x1f1\xf2\x17")
+    with pytest.raises(AssertionError, match="Checksum Failed"):
+        b58dec("5yh1rWBFZZFGWaRyxxaZYsKsGfr1TFHc", True)
+    with pytest.raises(ValueError, match="invalid base58 character '0'"):
+        b58dec("5yh1r0")
+
+def test_convert_records(payloads):
+    from sorzun.base58 import _convert_records
+    for check in (False, True):
+        out = _convert_records(False, check, None, payloads)
+        assert out == [(b58enc(pl, check) + "\n").encode() for pl in payloads]
+        assert all(line.count(b"\n") == 1 for line in out)
+        dec = _convert_records(True, check, None, [l[:-1] for l in out])
+        assert dec == [pl + b"\n" for pl in payloads]
+        wrapped = _convert_records(False, check, 20, payloads)
+        joined = [l.replace(b"\n", b"") for l in wrapped]
+        assert joined == [l[:-1] for l in out]
+        assert max(len(x) for l in wrapped for x in l.split(b"\n")) <= 20
+        dec = _convert_records(True, check, 20, joined)
+        assert dec == [pl + b"\n" for pl in payloads]
@@ -1,14 +1,16 @@
 """
 Test module for testing cashaddr codec. requires pytest
 """
+import os
 import os.path
 import json
 
 import pytest
 
 # pylint: disable=invalid-name
-from sorzun.cashaddr import cashenc, cashdec
-from sorzun.cashaddrconv import convert_word
+from sorzun.cashaddr import (
+    cashenc, cashdec, cashenc_many, cashdec_many, polymod, _polymod_reference, prefix_expand)
+from sorzun.cashaddrconv import convert_word, convert_lines
 
 #=========================== Load Test Vectors ===============================#
 
@@ -113,3 +115,50 @@ def test_bad_char():
     estr = "invalid base32 symbol 'b' at position 19"
     with pytest.raises(ValueError, match=estr):
         cashdec("bitcoincash:qz42g6m8d4p7u6zkvxgbf5583h4rz8dlsypzjp7zd0")
+
+def test_polymod():
+    """
+    Test that the table-driven polymod() matches the bitwise reference
+    implementation, including with a prefix expansion in front.
+    """
+    for n in range(0, 120, 7):
+        data = bytes(x & 0x1f for x in os.urandom(n))
+        assert polymod(data) == _polymod_reference(data)
+        data = prefix_expand("bitcoincash") + data
+        assert polymod(data) == _polymod_reference(data)
+
+def test_many():
+    """
+    Test that cashenc_many() and cashdec_many() agree with cashenc() and
+    cashdec() and report per-item errors instead of raising.
+    """
+    pls = [bytes.fromhex(tv["payload"]) for tv in test_vec[:6]]
+    pls = [b"\0" + pl for pl in pls if len(pl) == 20]
+    encoded = cashenc_many(pls + [None], "myprefix")
+    assert [e for e, _ in encoded[:-1]] == [cashenc(pl, "myprefix")
+                                            for pl in pls]
+    assert encoded[-1][0] is None and isinstance(encoded[-1][1], TypeError)
+
+    strings = [e for e, _ in encoded[:-1]] + [
+        "bitcoincash:thisismyaddressstring", "prefix:x64nx6hz",
+        "bchreg:555555555555555555555555555555555555555555555udxmlmrr"]
+    decoded = cashdec_many(strings)
+    assert [d for d, _ in decoded[:len(pls)]] == pls
+    assert isinstance(decoded[-3][1], ValueError)
+    assert decoded[-2] == (b"", None)
+    assert isinstance(decoded[-1][1], AssertionError)
+
+def test_convert_lines(legacy_pairs):
+    """
+    Test that convert_lines() formats one output row per word in every
+    output format, and reports bad words in place.
+    """
+    leg, cash = legacy_pairs[0]
+    lines = [(0, f"{leg} junk\n"), (1, "\n"), (2, cash)]
+    table, tsv, jsonl = (convert_lines(f, lines)
+                         for f in ("table", "tsv", "jsonl"))
+    assert table[0].splitlines()[0].split()[-2:] == [leg, cash]
+    assert "ERROR  junk" in table[0] and table[1] == ""
+    assert tsv[2].split("\t")[6:8] == [leg, cash]
+    rows = [json.loads(r) for r in jsonl[0].splitlines()]
+    assert rows[0]["cashaddr"] == cash and "error" in rows[1]
@@ -1,10 +1,12 @@
 import os.path
 import json
+import pickle
 
 import pytest
 
 from sorzun.deterministic import (
-    XPubKey, XPrivKey, PrivBIP32Node, PubBIP32Node, ProtocolError)
+    XPubKey, XPrivKey, PrivBIP32Node, PubBIP32Node, ProtocolError,
+    node_from_str)
 from sorzun.ecc import Point
 
 test_dir = os.path.dirname(os.path.realpath(__file__))
@@ -76,3 +78,112 @@ def test_xpub_ckd(xpub):
 def test_xpub_ckd_disallow_harddev(xpub):
     with pytest.raises(ProtocolError, match="It is disallowed to derive a"):
         der = xpub.ckd(2 ** 31)
+
+def test_children(root):
+    prv = root
+    pub = node_from_str(prv.xpub)
+    xprv, xpub = XPrivKey(*prv[:2]), XPubKey(*pub[:2])
+    indices = [0, 1, 7, 2 ** 31 - 1]
+    for key in (prv, pub, xprv, xpub):
+        assert key.children(indices) == [key.ckd(i) for i in indices]
+        assert key.ckd_range(3, 9) == [key.ckd(i) for i in range(3, 9)]
+        assert [type(k) for k in key.children(indices)] == \
+            [type(key.ckd(i)) for i in indices]
+    hard = [2 ** 31, 5, 2 ** 31 + 3]
+    for key in (prv, xprv):
+        assert key.children(hard) == [key.ckd(i) for i in hard]
+    with pytest.raises(ProtocolError, match="It is disallowed to derive a"):
+        pub.children(hard)
+
+def test_iter_children(root):
+    prv = root
+    pub = node_from_str(prv.xpub)
+    for key, start in ((pub, 5), (prv, 2 ** 31 + 1)):
+        it = key.iter_children(start, batch=16)
+        got = [next(it) for _ in range(40)]
+        assert got == key.ckd_range(start, start + 40)
+    tail = list(pub.iter_children(2 ** 31 - 3))
+    assert [k.index for k in tail] == [2 ** 31 - 3, 2 ** 31 - 2, 2 ** 31 - 1]
+    it = pub.iter_children(0, batch=1)
+    assert [next(it).index for _ in range(3)] == [0, 1, 2]
+    for batch in (0, -1):
+        with pytest.raises(ValueError, match="batch must be at least 1"):
+            next(pub.iter_children(0, batch=batch))
+
+def test_derivation_cache(root, memo):
+    cache = memo.derivation_cache
+    cache.clear()
+    prv = root
+    leaf = prv.derive("44H/0H/0H/0/3")
+    assert cache.stats[:4] == (0, 1, 0, 5)
+    assert prv.derive("44H/0H/0H/0/3") == leaf
+    sibling = prv.derive("44H/0H/0H/1/4")
+    assert sibling == prv.derive("44H").ckd(2 ** 31).ckd(2 ** 31).ckd(1).ckd(4)
+    assert cache.stats[:2] == (3, 1)
+    cache.resize(2)
+    assert len(cache) == 2 and cache.stats.evictions == 5
+    cache.resize(0)
+    assert prv.derive("44H/0H/0H/0/3") == leaf and len(cache) == 0
+
+def test_derivation_cache_private(root, memo, monkeypatch):
+    cache = memo.derivation_cache
+    prv = root
+    leaf = prv.derive("44H/0H/0H/0/3")
+    monkeypatch.setattr(memo, "cache_private", False)
+    cache.clear()
+    assert prv.derive("44H/0H/0H/0/3") == leaf and len(cache) == 0
+    pub = node_from_str(prv.xpub)
+    assert pub.derive("0/3").xpub == prv.derive("0/3").xpub
+    assert len(cache) == 2
+
+def test_derivation_cache_threads(root, memo):
+    from concurrent.futures import ThreadPoolExecutor
+    cache = memo.derivation_cache
+    cache.clear()
+    cache.resize(3)
+    prv = root
+    paths = [f"{a}/{b}/{c}" for a in range(3) for b in range(3)
+             for c in range(3)] * 4
+    with ThreadPoolExecutor(8) as pool:
+        got = list(pool.map(prv.derive, paths))
+    cache.resize(0)
+    assert got == [prv.derive(p) for p in paths]
+
+def test_memo(root, memo):
+    memo.configure_memo(16)
+    prv = type(root)(*root)  # fresh copy without cached attributes
+    prv.derive("0H/1")
+    assert prv.pubkey is prv.pubkey
+    assert prv.fingerprint == prv.id[:4] == prv.ckd(1).parent_fingerprint
+    assert prv.keydata in memo.pubkey_memo
+    assert len(memo.derivation_cache) > 0
+    memo.clear_private_memo()
+    assert len(memo.pubkey_memo) == 0
+    assert len(memo.derivation_cache) == 0
+    prv.derive("44H/0H/0H/0/3")
+    assert len(memo.derivation_cache) == 5
+    memo.configure_memo(16, private=False)
+    assert len(memo.derivation_cache) == 0
+    prv.derive("44H/0H/0H/0/3")
+    assert len(memo.derivation_cache) == 0
+    assert prv.xpub == node_from_str(prv.xpub).xpub
+    assert len(memo.pubkey_memo) == 0
+    assert len(memo.id_memo) > 0
+    memo.configure_memo()
+    assert memo.cache_private and memo.pubkey_memo.maxsize == 4096
+
+def test_node_cache(root):
+    prv = root
+    pub = node_from_str(prv.xpub)
+    for node in (prv, pub):
+        assert node.xpub is node.xpub and node.id is node.id
+        assert node.addr() is node.addr() and node.addr(b'0') != node.addr()
+        assert node.cashaddr() is node.cashaddr()
+        assert node.sec == bytes(node.pubkey)
+        assert node.fingerprint == node.id[:4]
+        assert node == type(node)(*node) and hash(node) == hash(tuple(node))
+        with pytest.raises(AttributeError, match="is immutable"):
+            node.xpub = "other"
+        with pytest.raises(AttributeError):
+            node.depth = 3
+        assert pickle.loads(pickle.dumps(node)) == node
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+
+from sorzun import ecc, field
+from sorzun.ecc import (
+    Point, JacobianPoint, PrecomputedPoint, G, N, BETA, LAMBDA, to_jacobian, from_jacobian,
+    jacobian_multiply, batch_from_jacobian, multi_mul, wnaf, glv_split)
+
+def _reference_mul(point, n):
+    return Point(*from_jacobian(jacobian_multiply(to_jacobian(point), n)))
+
+@pytest.fixture(scope="module")
+def scalars():
+    rand = [int.from_bytes(os.urandom(32), 'big') for _ in range(16)]
+    return [0, 1, 2, 15, 16, 2 ** 128, N - 1, N, N + 5, -3] + rand
+
+def test_fixed_base_mul(scalars):
+    for n in scalars:
+        assert G * n == _reference_mul(G, n)
+        assert Point.from_priv(n) == _reference_mul(G, n)
+
+def test_gtable_save_load(tmp_path):
+    fn = tmp_path / "gtable.bin"
+    table = ecc.gtable()
+    ecc.save_gtable(fn)
+    assert ecc.load_gtable(fn) == table
+    fn.write_bytes(fn.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="bad generator table size"):
+        ecc.load_gtable(fn)
+    assert ecc.gtable() == table
+    # a table of valid curve points in the wrong places is rejected
+    ecc.save_gtable(fn)
+    b = fn.read_bytes()
+    fn.write_bytes(b[64:128] + b[:64] + b[128:])
+    with pytest.raises(ValueError, match="bad generator table data"):
+        ecc.load_gtable(fn)
+    assert list(tmp_path.iterdir()) == [fn]
+
+def test_gtable_env(tmp_path, monkeypatch):
+    fn = tmp_path / "gtable.bin"
+    table = ecc.gtable()
+    monkeypatch.setenv("SORZUN_GTABLE", str(fn))
+    for content in (None, b"junk"):
+        if content is not None:
+            fn.write_bytes(content)
+        monkeypatch.setattr(ecc, "_gtable", None)
+        assert ecc.gtable() == table
+        assert fn.read_bytes() == b"".join(
+            x.to_bytes(32, "big") + y.to_bytes(32, "big")
+            for row in table for x, y in row)
+    monkeypatch.setattr(ecc, "_gtable", None)
+    monkeypatch.setenv("SORZUN_GTABLE", str(tmp_path / "no" / "such"))
+    assert G * 12345 == _reference_mul(G, 12345)
+
+def test_wnaf():
+    for n in [0, 1, 7, 2 ** 255 + 12345, N - 1]:
+        for w in range(2, 7):
+            digits = wnaf(n, w)
+            assert sum(d << i for i, d in enumerate(digits)) == n
+            assert all(d == 0 or (d % 2 and abs(d) < 2 ** (w - 1))
+                       for d in digits)
+
+def test_variable_base_mul(scalars):
+    pt = G * 0xDEADBEEF
+    pre = PrecomputedPoint(pt)
+    for n in scalars:
+        ref = _reference_mul(pt, n)
+        assert pt * n == ref
+        assert Point(*from_jacobian(pre.multiply(n))) == ref
+        assert Point(*from_jacobian(pre.wnaf_multiply(n))) == ref
+
+def test_glv_split(scalars):
+    for n in scalars:
+        k1, k2 = glv_split(n)
+        assert (k1 + k2 * LAMBDA - n) % N == 0
+        assert abs(k1).bit_length() <= 129 and abs(k2).bit_length() <= 129
+    assert G * LAMBDA == Point(BETA * G.x % ecc.P, G.y)
+
+def test_batch_from_jacobian(scalars):
+    pre = PrecomputedPoint(G * 7)
+    jpts = [pre.multiply(n) for n in scalars]
+    assert batch_from_jacobian(jpts) == [from_jacobian(p) for p in jpts]
+    assert batch_from_jacobian([]) == []
+
+def test_batch_mul(scalars):
+    pt = G * 0xC0FFEE
+    assert G.batch_mul(scalars) == [G * n for n in scalars]
+    assert pt.batch_mul(scalars) == [_reference_mul(pt, n) for n in scalars]
+
+def test_jacobian_point(scalars):
+    pt = G * 0xBADC0DE
+    for n in scalars[1:]:
+        lazy = JacobianPoint.from_priv(n) + pt
+        assert lazy.to_point() == G * n + pt
+        assert (lazy.x, lazy.y) == G * n + pt
+        assert bytes(lazy) == bytes(G * n + pt)
+        assert pt + JacobianPoint(*G) == JacobianPoint(*G) + pt
+        assert JacobianPoint(*pt) * n == pt * n
+    lazy = JacobianPoint.from_priv(scalars[-1]) + pt
+    assert lazy._affine is None
+
+def test_field(scalars):
+    assert field.backend() in ('gmpy2', 'builtin', 'python')
+    for n in scalars:
+        a = n % field.P
+        if a:
+            assert (field.inv(a) * a) % field.P == 1
+            assert field._inv_euclid(a, field.P) == field.inv(a)
+        assert field.inv(a, N) == field._inv_euclid(a % N, N)
+        pt = G * n
+        assert Point.from_bytes(bytes(pt)) == pt or n % N == 0
+
+@pytest.mark.parametrize("size", [1, 2, 5, ecc.PIPPENGER_THRESHOLD + 7])
+def test_multi_mul(size, scalars):
+    pts = [G * (i + 3) for i in range(size)]
+    terms = list(zip(scalars * size, pts))
+    ref = Point(0, 0)
+    for n, pt in terms:
+        ref = ref + _reference_mul(pt, n)
+    assert multi_mul(terms) == ref
+    assert multi_mul(terms + [(5, G), (1, pts[0])]) == ref + G * 5 + pts[0]
@@ -0,0 +1,42 @@
+import pytest
+
+from sorzun.deterministic import node_from_str
+from sorzun.keystore import KeyStore, write_keystore
+
+def test_keystore(tmp_path, account):
+    chain = node_from_str(account.ckd(0).xpub)
+    fn = tmp_path / "keys.bin"
+    indices = list(range(10, 47)) + [2 ** 31 - 1]
+    assert write_keystore(fn, chain, indices, chunk=8) == len(indices)
+    expected = chain.children(indices)
+    with KeyStore(fn) as store:
+        assert len(store) == len(indices)
+        assert list(store) == expected
+        assert store[-1] == expected[-1]
+        assert store.hash160(3) == expected[3].id
+        assert store.sec(5) == expected[5].sec
+        sec = store.sec(0)
+        assert store.index(7) == 17
+        assert len(store.pubkeys) == 33 * len(indices)
+        with pytest.raises(IndexError):
+            store[len(indices)]
+    assert sec == expected[0].sec
+    write_keystore(fn, chain, iter(indices), chunk=8, workers=2)
+    with KeyStore(fn) as store:
+        assert list(store) == expected
+    assert write_keystore(fn, chain, range(10, 47), chunk=8) == 37
+    store = KeyStore(fn)
+    view = store.pubkeys[:33]
+    with pytest.raises(BufferError):
+        store.close()
+    view.release()
+    store.close()
+    fn.write_bytes(fn.read_bytes()[:-100])
+    with pytest.raises(ValueError, match="size does not match"):
+        KeyStore(fn)
+    fn.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError, match="not a key store"):
+        KeyStore(fn)
+    fn.write_bytes(b"SZKS")
+    with pytest.raises(ValueError, match="not a key store"):
+        KeyStore(fn)
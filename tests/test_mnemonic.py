@@ -92,3 +92,70 @@ def test_checksum_fail():
         x = bad_words[:l]
         with pytest.raises(ValueError, match="Bad mnemonic checksum"):
             Mnemonic(x)
+
+def test_wordlist_lookup():
+    wl = WORDLISTS["english"]
+    assert all(wl.index(w) == i for i, w in enumerate(wl))
+    assert "zoo" in wl and "zooo" not in wl
+    with pytest.raises(ValueError, match="not in word list"):
+        wl.index("zooo")
+    assert wl.expand("aban") == wl.expand("abando") == "abandon"
+    assert wl.expand("act") == "act"
+    for bad in ("abandonx", "ab", "qqqq"):
+        with pytest.raises(ValueError, match="does not identify a word"):
+            wl.expand(bad)
+
+def test_lazy_wordlists():
+    from sorzun.mnemonic import _WordLists, LANGS
+    wls = _WordLists(LANGS)
+    assert list(wls) == LANGS and len(wls) == len(LANGS)
+    assert not wls._loaded
+    assert wls["french"] is wls["french"] and list(wls._loaded) == ["french"]
+    with pytest.raises(KeyError):
+        wls["klingon"]
+    assert dict(wls)["korean"] == WORDLISTS["korean"]
+
+def test_to_entropy(testvec):
+    wl, passphrase, vectors = testvec
+    for tv in vectors:
+        ent = bytes.fromhex(tv["entropy"])
+        m = Mnemonic(ent, wl)
+        assert m.to_entropy() == ent
+        assert Mnemonic.from_indices(m.to_indices(), wl) == m
+
+def test_from_indices():
+    assert Mnemonic.from_indices([0] * 11 + [3]) == \
+        ("abandon",) * 11 + ("about",)
+    with pytest.raises(ValueError, match="Bad mnemonic checksum"):
+        Mnemonic.from_indices([0] * 12)
+
+def test_seeds_many(testvec):
+    from sorzun.mnemonic import seeds_many
+    wl, passphrase, vectors = testvec
+    vectors = vectors[:6]
+    phrases = [tv["mnemonic"] for tv in vectors]
+    for kw in ({"workers": 1}, {"workers": 2}, {"workers": 2, "threads": False}):
+        res = list(seeds_many(phrases, passphrase, chunk=4, lang=wl, **kw))
+        assert [r.seed.hex() for r in res] == [tv["seed"] for tv in vectors]
+        assert [r.mnemonic for r in res] == [Mnemonic(p, wl) for p in phrases]
+        assert all(r.elapsed > 0 for r in res)
+    m = Mnemonic(16)
+    res = list(seeds_many([m, m], [b"", b"x"], workers=2))
+    assert [r.seed for r in res] == [m.to_seed(), m.to_seed(b"x")]
+    for pws in ([b""], [b""] * 3):
+        with pytest.raises(ValueError, match="passwords than mnemonics"):
+            list(seeds_many([m, m], pws, workers=1))
+    with pytest.raises(ValueError, match="Bad mnemonic checksum"):
+        list(seeds_many([bad_words[:12]]))
+
+def test_abbreviated(testvec):
+    wl, passphrase, vectors = testvec
+    for tv in vectors:
+        full = Mnemonic(tv["mnemonic"], wl)
+        short = [w[:4] if len(w) > 4 and w[:4] in full.wordlist.prefixes
+                 else w for w in full]
+        assert Mnemonic(short, wl) == full
+        assert Mnemonic(" ".join(short), wl).to_seed(passphrase).hex() == \
+            tv["seed"]
+    with pytest.raises(ValueError, match=r"Bad word\(s\).*'abanx'"):
+        Mnemonic(["abanx"] + ["abandon"] * 10 + ["about"])
@@ -0,0 +1,10 @@
+from sorzun.deterministic import node_from_str
+from sorzun.parallel import derive_range
+
+def test_derive_range(account):
+    prv = account
+    pub = node_from_str(prv.xpub)
+    for node, indices in ((pub, range(50)), (prv, [2 ** 31 + 2, 3, 9, 1])):
+        got = list(derive_range(node, indices, workers=2, chunk=7))
+        assert got == node.children(indices)
+        assert [type(x) for x in got] == [type(node)] * len(got)
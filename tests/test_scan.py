@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from sorzun.scan import scan_account, discover, ascan_account, adiscover
+
+def _oracle(root, paths):
+    "Return an oracle reporting the addresses at `paths` of `root` as used"
+    used = {root.derive(p).id for p in paths}
+    calls = []
+    def is_used(batch):
+        calls.append(len(batch))
+        return [x in used for x in batch]
+    return is_used, calls
+
+def test_scan_account(root, account):
+    is_used, calls = _oracle(root, ["44H/0H/0H/0/3", "44H/0H/0H/0/12",
+                                    "44H/0H/0H/1/0"])
+    ext, inte = scan_account(account, is_used, gap_limit=10, batch=4)
+    assert ext.used == [3, 12] and ext.derived == 24
+    assert inte.used == [0] and inte.derived == 12
+    assert all(n == 4 for n in calls) and len(calls) == 9
+    assert ext.derive_time > 0 and ext.query_time >= 0
+
+def test_discover(root):
+    is_used, _ = _oracle(root, ["44H/0H/0H/0/0", "44H/0H/1H/0/15"])
+    res = discover(root, is_used, gap_limit=20)
+    assert [(r.account, r.chain, r.used) for r in res] == [
+        (0, 0, [0]), (0, 1, []), (1, 0, [15]), (1, 1, []), (2, 0, [])]
+    assert res[2].derived == 40
+
+def test_async(root, account):
+    is_used, _ = _oracle(root, ["44H/0H/0H/1/5"])
+    async def ais_used(batch):
+        return is_used(batch)
+    sync = scan_account(account, is_used, key=lambda n: n.id)
+    for oracle in (is_used, ais_used):
+        res = asyncio.run(ascan_account(account, oracle))
+        assert [r[:4] for r in res] == [r[:4] for r in sync]
+    res = asyncio.run(adiscover(root, ais_used))
+    assert [(r.account, r.chain, r.used) for r in res] == [(0, 0, [])]
+
+def test_oracle_length(account):
+    with pytest.raises(ValueError, match="oracle returned 3 results for 4"):
+        scan_account(account, lambda batch: [True] * 3, batch=4)
@@ -0,0 +1,101 @@
+import subprocess
+import sys
+import threading
+
+from sorzun.util import LRUCache, cached_property, pool_map
+
+def test_lrucache_threads():
+    cache = LRUCache(4)
+    errors = []
+
+    def worker(seed):
+        try:
+            for i in range(20000):
+                k = (seed * 7 + i) % 9
+                cache.put(k, k)
+                assert cache.get(k, k) == k
+                _, v = cache.lookup([(k + 1) % 9, k])
+                assert v is None or v in range(9)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old)
+    assert errors == []
+    assert len(cache) <= 4
+    st = cache.stats
+    assert st.hits + st.misses == 8 * 20000 * 2
+
+def _square_chunk(items):
+    return [x * x for x in items]
+
+def test_pool_map_order():
+    for threads in (False, True):
+        got = list(pool_map(_square_chunk, range(1000), 3, 7, threads))
+        assert got == [x * x for x in range(1000)]
+    assert list(pool_map(_square_chunk, [], 2)) == []
+
+def test_pool_map_window():
+    pulled = []
+    def items():
+        for i in range(10 ** 6):
+            pulled.append(i)
+            yield i
+    it = pool_map(_square_chunk, items(), 2, 5, threads=True)
+    assert [next(it) for _ in range(12)] == [x * x for x in range(12)]
+    # at most two chunks per worker are submitted ahead of the consumer
+    assert len(pulled) <= (2 * 2 + 2) * 5
+    it.close()
+
+def test_cached_property():
+    calls = []
+    class Frozen:
+        def __setattr__(self, name, value):
+            raise AttributeError("is immutable")
+        @cached_property
+        def value(self):
+            "the value"
+            calls.append(1)
+            return object()
+    f = Frozen()
+    assert f.value is f.value and len(calls) == 1
+    assert Frozen.value.__doc__ == "the value"
+
+def test_cached_property_fallback():
+    # run the BIP32 node classes and word lists with functools.cached_property missing, as
+    # on Python 3.7
+    code = (
+        "import functools; del functools.cached_property\n"
+        "from sorzun.util import cached_property\n"
+        "from sorzun.deterministic import PrivBIP32Node, node_from_str\n"
+        "prv = PrivBIP32Node.from_entropy(bytes(range(16)))\n"
+        "assert type(type(prv).__dict__['xpub']) is cached_property\n"
+        "pub = node_from_str(prv.xpub)\n"
+        "assert pub.xpub is pub.xpub == prv.xpub\n"
+        "assert prv.ckd(1).parent_fingerprint == pub.fingerprint\n"
+        "from sorzun.mnemonic import WORDLISTS\n"
+        "assert WORDLISTS['english'].expand('aban') == 'abandon'\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_pool_map_close():
+    release = threading.Event()
+    done = []
+    def blocking(items):
+        if items != [0]:
+            release.wait()
+        done.extend(items)
+        return items
+    it = pool_map(blocking, range(100), 2, 1, threads=True)
+    assert next(it) == 0
+    # chunks 1 and 2 occupy both workers, chunk 3 is still queued
+    threading.Timer(0.1, release.set).start()
+    it.close()
+    assert sorted(done) == [0, 1, 2]